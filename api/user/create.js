@@ -9,6 +9,101 @@ const supabase = createClient(
 
 const JWT_SECRET = process.env.JWT_SECRET;
 
+const MAX_BULK_USERS = 100;
+
+// Create many users in one request; every entry gets its own result
+async function createUsers(users, decoded, res) {
+  if (users.length === 0 || users.length > MAX_BULK_USERS) {
+    return res.status(400).json({ error: `Jumlah user harus antara 1 dan ${MAX_BULK_USERS}` });
+  }
+
+  const results = users.map((user, index) => ({
+    index,
+    username: user && user.username,
+    success: false
+  }));
+
+  const usernames = users.map(user => user && user.username).filter(Boolean);
+  const { data: existingUsers, error: existingError } = await supabase
+    .from('users')
+    .select('username')
+    .in('username', usernames);
+
+  if (existingError) {
+    console.error('Check users error:', existingError);
+    return res.status(500).json({ error: 'Gagal membuat user' });
+  }
+
+  const taken = new Set((existingUsers || []).map(user => user.username));
+  const pending = [];
+
+  users.forEach((user, index) => {
+    const { username, email, password, role, assigned_desa = [], assigned_kelompok = [] } = user || {};
+
+    if (!username || !password || !role) {
+      results[index].error = 'Username, password, dan role harus diisi';
+      return;
+    }
+
+    if (taken.has(username)) {
+      results[index].error = 'Username sudah digunakan';
+      return;
+    }
+
+    taken.add(username);
+    pending.push({
+      index,
+      row: {
+        username,
+        email,
+        password_hash: password, // Plain text, as for single users
+        role,
+        assigned_desa,
+        assigned_kelompok,
+        status: 'active',
+        created_by: decoded.userId
+      }
+    });
+  });
+
+  if (pending.length > 0) {
+    const { data: newUsers, error: insertError } = await supabase
+      .from('users')
+      .insert(pending.map(item => item.row))
+      .select();
+
+    if (insertError) {
+      console.error('Insert error:', insertError);
+      pending.forEach(item => {
+        results[item.index].error = 'Gagal membuat user';
+      });
+    } else {
+      const byUsername = new Map(newUsers.map(user => [user.username, user]));
+      pending.forEach(item => {
+        const newUser = byUsername.get(item.row.username);
+        results[item.index].success = true;
+        results[item.index].data = {
+          id: newUser.id,
+          username: newUser.username,
+          email: newUser.email,
+          role: newUser.role,
+          assigned_desa: newUser.assigned_desa,
+          assigned_kelompok: newUser.assigned_kelompok
+        };
+      });
+    }
+  }
+
+  const created = results.filter(result => result.success).length;
+
+  res.status(created > 0 ? 201 : 400).json({
+    success: created > 0,
+    message: `${created} dari ${users.length} user berhasil dibuat`,
+    created,
+    results
+  });
+}
+
 export default async function handler(req, res) {
   res.setHeader('Access-Control-Allow-Origin', '*');
   res.setHeader('Access-Control-Allow-Methods', 'POST, OPTIONS');
@@ -37,6 +132,10 @@ export default async function handler(req, res) {
       return res.status(403).json({ error: 'Akses ditolak. Hanya super admin yang bisa membuat user.' });
     }
 
+    if (Array.isArray(req.body.users)) {
+      return createUsers(req.body.users, decoded, res);
+    }
+
     const { username, email, password, role, assigned_desa = [], assigned_kelompok = [] } = req.body;
 
     if (!username || !password || !role) {
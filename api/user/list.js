@@ -8,6 +8,9 @@ const supabase = createClient(
 
 const JWT_SECRET = process.env.JWT_SECRET;
 
+const DEFAULT_PAGE_SIZE = 100;
+const MAX_PAGE_SIZE = 500;
+
 export default async function handler(req, res) {
   res.setHeader('Access-Control-Allow-Origin', '*');
   res.setHeader('Access-Control-Allow-Methods', 'GET, OPTIONS');
@@ -36,20 +39,53 @@ export default async function handler(req, res) {
       return res.status(403).json({ error: 'Akses ditolak. Hanya super admin yang bisa melihat daftar user.' });
     }
 
-    // Get all users
-    const { data: users, error } = await supabase
+    const columns = 'id, username, email, role, assigned_desa, assigned_kelompok, status, created_at';
+    const { limit, cursor } = req.query;
+
+    if (limit === undefined) {
+      // Get all users (unpaginated, kept for existing callers)
+      const { data: users, error } = await supabase
+        .from('users')
+        .select(columns)
+        .order('created_at', { ascending: false });
+
+      if (error) {
+        console.error('Get users error:', error);
+        return res.status(500).json({ error: 'Gagal mengambil data user' });
+      }
+
+      return res.status(200).json({
+        success: true,
+        data: users
+      });
+    }
+
+    // Keyset pagination: `cursor` is the last id of the previous page
+    const pageSize = Math.min(Math.max(parseInt(limit, 10) || DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE);
+    let query = supabase
       .from('users')
-      .select('id, username, email, role, assigned_desa, assigned_kelompok, status, created_at')
-      .order('created_at', { ascending: false });
+      .select(columns)
+      .order('id', { ascending: true })
+      .limit(pageSize + 1);
+
+    if (cursor) {
+      query = query.gt('id', parseInt(cursor, 10));
+    }
+
+    const { data: users, error } = await query;
 
     if (error) {
       console.error('Get users error:', error);
       return res.status(500).json({ error: 'Gagal mengambil data user' });
     }
 
+    const hasMore = users.length > pageSize;
+    const page = hasMore ? users.slice(0, pageSize) : users;
+
     res.status(200).json({
       success: true,
-      data: users
+      data: page,
+      next_cursor: hasMore ? String(page[page.length - 1].id) : null
     });
 
   } catch (error) {
@@ -1,3 +1,4 @@
+const crypto = require('crypto');
 const jwt = require('jsonwebtoken');
 const { createClient } = require('@supabase/supabase-js');
 
@@ -11,7 +12,8 @@ const JWT_SECRET = process.env.JWT_SECRET;
 export default async function handler(req, res) {
   res.setHeader('Access-Control-Allow-Origin', '*');
   res.setHeader('Access-Control-Allow-Methods', 'GET, OPTIONS');
-  res.setHeader('Access-Control-Allow-Headers', 'Content-Type, Authorization');
+  res.setHeader('Access-Control-Allow-Headers', 'Content-Type, Authorization, If-None-Match');
+  res.setHeader('Access-Control-Expose-Headers', 'ETag');
   
   if (req.method === 'OPTIONS') {
     return res.status(200).end();
@@ -35,7 +37,8 @@ export default async function handler(req, res) {
       const { data: permissions, error: permError } = await supabase
         .from('role_permissions')
         .select('*')
-        .eq('role', decoded.role);
+        .eq('role', decoded.role)
+        .order('menu_name');
 
       if (permError) {
         console.error('Permission error:', permError);
@@ -52,22 +55,33 @@ export default async function handler(req, res) {
         };
       });
 
+      const data = {
+        user: {
+          id: decoded.userId,
+          username: decoded.username,
+          role: decoded.role,
+          assigned_desa: decoded.assigned_desa,
+          assigned_kelompok: decoded.assigned_kelompok
+        },
+        permissions: menuPermissions,
+        accessible_areas: {
+          desa: decoded.assigned_desa || [],
+          kelompok: decoded.assigned_kelompok || []
+        }
+      };
+
+      // Let clients skip re-downloading an unchanged snapshot
+      const etag = '"' + crypto.createHash('sha256').update(JSON.stringify(data)).digest('hex') + '"';
+      res.setHeader('ETag', etag);
+      res.setHeader('Cache-Control', 'private, no-cache');
+
+      if (req.headers['if-none-match'] === etag) {
+        return res.status(304).end();
+      }
+
       res.status(200).json({
         success: true,
-        data: {
-          user: {
-            id: decoded.userId,
-            username: decoded.username,
-            role: decoded.role,
-            assigned_desa: decoded.assigned_desa,
-            assigned_kelompok: decoded.assigned_kelompok
-          },
-          permissions: menuPermissions,
-          accessible_areas: {
-            desa: decoded.assigned_desa || [],
-            kelompok: decoded.assigned_kelompok || []
-          }
-        }
+        data
       });
 
     } catch (jwtError) {
@@ -36,9 +36,9 @@ export default async function handler(req, res) {
     }
 
     const { id } = req.query;
-    const { username, email, password, role, status } = req.body;
+    const { username, email, password, role, status, assigned_desa, assigned_kelompok } = req.body;
 
-    const updateData = { username, email, role, status };
+    const updateData = { username, email, role, status, assigned_desa, assigned_kelompok };
     if (password) updateData.password_hash = password;
 
     const { data, error } = await supabase
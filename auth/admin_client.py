@@ -0,0 +1,295 @@
+import csv
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from auth.circuit_breaker import CircuitOpenError
+
+# Worth retrying: the same request may succeed a moment later
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+# A POST (create) may already have been committed when these come back,
+# so it is only retried on statuses that mean it was not processed
+POST_RETRY_STATUSES = frozenset([429, 503])
+
+# Columns understood in user CSV files; list columns are separated by ';'
+USER_FIELDS = ('username', 'email', 'password', 'role', 'assigned_desa', 'assigned_kelompok', 'status')
+LIST_FIELDS = ('assigned_desa', 'assigned_kelompok')
+CSV_LIST_SEPARATOR = ';'
+# A list cell holding only this clears the assignment in an update; a blank
+# cell leaves it unchanged
+CLEAR_MARKER = '-'
+
+# Upper bound of users per bulk create request (MAX_BULK_USERS in create.js)
+MAX_BATCH_SIZE = 100
+
+
+class AdminClientError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RowResult:
+    """Outcome of one CSV row in a bulk operation"""
+    
+    def __init__(self, row_number, username, success, status_code=None, error=None, data=None, attempts=1):
+        self.row_number = row_number
+        self.username = username
+        self.success = success
+        self.status_code = status_code
+        self.error = error
+        self.data = data
+        self.attempts = attempts
+    
+    def __repr__(self):
+        state = 'ok' if self.success else f"error={self.error!r}"
+        return f"RowResult(row={self.row_number}, username={self.username!r}, {state})"
+
+
+def read_users_csv(path):
+    """Read user rows from a CSV file with a header line"""
+    rows = []
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for record in csv.DictReader(f):
+            row = {}
+            for key, value in record.items():
+                if key is None:
+                    continue
+                key = key.strip()
+                value = (value or '').strip()
+                if key in LIST_FIELDS:
+                    row[key] = [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+                elif key == 'id':
+                    try:
+                        row[key] = int(value) if value else None
+                    except ValueError:
+                        row[key] = value  # Reported as a failed row by bulk_update()
+                else:
+                    row[key] = value
+            rows.append(row)
+    return rows
+
+
+class AdminClient:
+    """User management for super admins, on top of a logged-in LoginManager.
+    
+    Bulk operations run on a pool of `max_workers` threads sharing the login
+    manager's connection pool. Requests failing with a connection error or
+    a retryable status are retried `max_retries` times with exponential
+    backoff; an expired token is refreshed once.
+    """
+    
+    def __init__(self, login_manager, max_workers=4, max_retries=3, backoff_factor=0.5,
+                 batch_size=50, page_size=100):
+        self.login_manager = login_manager
+        self.transport = login_manager.transport
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+        self.page_size = page_size
+    
+    def _ensure_logged_in(self):
+        if not self.login_manager.is_logged_in():
+            raise AdminClientError("Sesi tidak valid, silakan login kembali", 401)
+    
+    @staticmethod
+    def _not_sent(error):
+        """True if the request surely never reached the server"""
+        import requests
+        from urllib3.exceptions import NewConnectionError
+        
+        if isinstance(error, (CircuitOpenError, requests.exceptions.ConnectTimeout)):
+            return True
+        if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+            return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+        return False
+    
+    def _call(self, method, endpoint, **kwargs):
+        """Send a request with retries; returns (response, attempts).
+        
+        A POST is not idempotent: it is retried only when it was not sent
+        or the server answered 429/503, so a create that was committed
+        before a timeout is never sent twice.
+        """
+        import requests
+        
+        idempotent = method != 'POST'
+        retry_statuses = RETRY_STATUSES if idempotent else POST_RETRY_STATUSES
+        attempt = 0
+        refreshed = False
+        while True:
+            attempt += 1
+            headers = {'Authorization': f'Bearer {self.login_manager.access_token}'}
+            try:
+                response = self.transport.request(method, endpoint, headers=headers, **kwargs)
+            except (requests.exceptions.RequestException, CircuitOpenError) as e:
+                if attempt > self.max_retries or not (idempotent or self._not_sent(e)):
+                    raise
+                time.sleep(self.backoff_factor * (2 ** (attempt - 1)))
+                continue
+            
+            if response.status_code == 401 and not refreshed:
+                refreshed = True
+                if self.login_manager.refresh_access_token():
+                    attempt -= 1
+                    continue
+            
+            if response.status_code in retry_statuses and attempt <= self.max_retries:
+                time.sleep(self.backoff_factor * (2 ** (attempt - 1)))
+                continue
+            
+            return response, attempt
+    
+    @staticmethod
+    def _json(response):
+        try:
+            return response.json() or {}
+        except ValueError:
+            return {}
+    
+    def _checked(self, response):
+        data = self._json(response)
+        if response.status_code >= 400 or not data.get('success'):
+            raise AdminClientError(data.get('error', f"HTTP {response.status_code}"), response.status_code)
+        return data
+    
+    @staticmethod
+    def _payload(row, defaults=None):
+        payload = dict(defaults or {})
+        for field in USER_FIELDS:
+            value = row.get(field)
+            if value is not None and value != '':
+                payload[field] = value
+        return payload
+    
+    @staticmethod
+    def _update_payload(fields):
+        """Fields to change; blank list cells are left out, CLEAR_MARKER clears"""
+        payload = {}
+        for field in USER_FIELDS:
+            value = fields.get(field)
+            if value is None or value == '' or (field in LIST_FIELDS and not value):
+                continue
+            if field in LIST_FIELDS and list(value) == [CLEAR_MARKER]:
+                value = []
+            payload[field] = value
+        return payload
+    
+    def list_users(self, page_size=None):
+        """Yield every user, one page per request.
+        
+        Deployments without pagination return all users in the first
+        response and no cursor, which ends the listing as well.
+        """
+        self._ensure_logged_in()
+        cursor = None
+        while True:
+            params = {'limit': page_size or self.page_size}
+            if cursor:
+                params['cursor'] = cursor
+            
+            response, _ = self._call('GET', 'list_users', params=params)
+            data = self._checked(response)
+            yield from data.get('data') or []
+            
+            cursor = data.get('next_cursor')
+            if not cursor:
+                return
+    
+    def create_user(self, user):
+        self._ensure_logged_in()
+        response, _ = self._call('POST', 'create_user', json=self._payload(user))
+        return self._checked(response)['data']
+    
+    def update_user(self, user_id, fields):
+        self._ensure_logged_in()
+        response, _ = self._call('PUT', 'update_user', path_params={'id': user_id},
+                                 json=self._update_payload(fields))
+        return self._checked(response)['data']
+    
+    def bulk_create(self, rows):
+        """Create users in batches of `batch_size`; returns a RowResult per row"""
+        self._ensure_logged_in()
+        numbered = list(enumerate(rows, start=1))
+        batches = [numbered[i:i + self.batch_size] for i in range(0, len(numbered), self.batch_size)]
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return [result for batch in executor.map(self._create_batch, batches) for result in batch]
+    
+    def _create_batch(self, batch):
+        payload = [self._payload(row, {'assigned_desa': [], 'assigned_kelompok': []}) for _, row in batch]
+        try:
+            response, attempts = self._call('POST', 'create_user', json={'users': payload})
+        except Exception as e:
+            return [RowResult(number, row.get('username'), False, error=str(e)) for number, row in batch]
+        
+        data = self._json(response)
+        results = data.get('results')
+        if results is None:
+            if response.status_code == 400:
+                # Server without bulk support: fall back to one request per user
+                return [self._create_one(number, row) for number, row in batch]
+            error = data.get('error', f"HTTP {response.status_code}")
+            return [RowResult(number, row.get('username'), False, response.status_code, error, attempts=attempts)
+                    for number, row in batch]
+        
+        by_index = {result.get('index'): result for result in results}
+        row_results = []
+        for index, (number, row) in enumerate(batch):
+            result = by_index.get(index, {})
+            row_results.append(RowResult(
+                number, row.get('username'), bool(result.get('success')), response.status_code,
+                result.get('error'), result.get('data'), attempts
+            ))
+        return row_results
+    
+    def _create_one(self, number, row):
+        try:
+            response, attempts = self._call('POST', 'create_user', json=self._payload(row))
+        except Exception as e:
+            return RowResult(number, row.get('username'), False, error=str(e))
+        
+        data = self._json(response)
+        success = response.status_code < 400 and bool(data.get('success'))
+        return RowResult(number, row.get('username'), success, response.status_code,
+                         None if success else data.get('error'), data.get('data'), attempts)
+    
+    def bulk_update(self, rows):
+        """Update users concurrently; rows carry an `id` or a known `username`"""
+        self._ensure_logged_in()
+        ids = {}
+        if any(not row.get('id') for row in rows):
+            ids = {user['username']: user['id'] for user in self.list_users()}
+        
+        def update(item):
+            number, row = item
+            user_id = row.get('id')
+            if user_id is not None and user_id != '':
+                try:
+                    user_id = int(user_id)
+                except (TypeError, ValueError):
+                    return RowResult(number, row.get('username'), False, error=f"id tidak valid: {user_id!r}")
+            else:
+                user_id = ids.get(row.get('username'))
+            if not user_id:
+                return RowResult(number, row.get('username'), False, error="User tidak ditemukan")
+            
+            try:
+                response, attempts = self._call('PUT', 'update_user', path_params={'id': user_id},
+                                                json=self._update_payload(row))
+            except Exception as e:
+                return RowResult(number, row.get('username'), False, error=str(e))
+            
+            data = self._json(response)
+            success = response.status_code < 400 and bool(data.get('success'))
+            return RowResult(number, row.get('username'), success, response.status_code,
+                             None if success else data.get('error'), data.get('data'), attempts)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(update, enumerate(rows, start=1)))
+    
+    def bulk_create_csv(self, path):
+        return self.bulk_create(read_users_csv(path))
+    
+    def bulk_update_csv(self, path):
+        return self.bulk_update(read_users_csv(path))
\ No newline at end of file
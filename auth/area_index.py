@@ -0,0 +1,176 @@
+import itertools
+
+# The area catalog is compiled from the database/schema.sql seed rows by
+# tools/compile_role_defaults.py. Assignments of single-desa accounts are
+# merged into DESA_KELOMPOK when an index is built.
+from auth.role_defaults import ALL_DESA, ALL_KELOMPOK, DESA_KELOMPOK  # noqa: F401
+
+
+def is_missing(value):
+    """None, '', NaN or pandas NA: an area cell that is not filled in"""
+    if isinstance(value, str):
+        return not value
+    if value is None:
+        return True
+    try:
+        return bool(value != value)  # NaN
+    except TypeError:
+        return True  # pandas.NA refuses to be truth-tested
+
+
+def denied_mask(values):
+    """All-False mask shaped like row_mask() output for `values`"""
+    if hasattr(values, 'isin'):
+        return values.isna() & values.notna()
+    
+    if type(values).__module__ == 'numpy':
+        import numpy as np
+        return np.zeros(len(values), dtype=bool)
+    
+    return [False] * len(values)
+
+
+def _column_mask(values, allowed):
+    """Vectorized `is_missing(value) or value in allowed` over a column"""
+    import numpy as np
+    
+    if not hasattr(values, 'isin'):
+        values = np.asarray(values)
+        if values.dtype.kind in 'US':
+            return (values == values.dtype.type()) | np.isin(values, list(allowed))
+        
+        try:
+            import pandas as pd
+        except ImportError:
+            # Object array without pandas: None/NaN are missing, the rest compared as text
+            missing = (values == None) | (values != values)  # noqa: E711
+            present = np.where(missing, '', values).astype(str)
+            return missing | (present == '') | np.isin(present, list(allowed))
+        values = pd.Series(values, dtype=object)
+    
+    # Hash-based isin; NaN, None and pd.NA (nullable and string dtypes) count as missing
+    return (values.isna() | values.isin(list(allowed) + [''])).to_numpy(dtype=bool, copy=True)
+
+
+class AreaIndex:
+    """Set-based view of the areas a user may access, built once per login"""
+    
+    def __init__(self, desa, kelompok, unrestricted=False, hierarchy=None):
+        self.desa_list = list(desa)
+        self.kelompok_list = list(kelompok)
+        self.desa_set = frozenset(self.desa_list)
+        self.kelompok_set = frozenset(self.kelompok_list)
+        self.unrestricted = unrestricted
+        
+        self.kelompok_by_desa = {}
+        self.desa_by_kelompok = {}
+        for desa_name, kelompok_names in (hierarchy or {}).items():
+            self.kelompok_by_desa[desa_name] = tuple(kelompok_names)
+            for kelompok_name in kelompok_names:
+                self.desa_by_kelompok[kelompok_name] = desa_name
+    
+    @classmethod
+    def build(cls, user, accessible_areas, hierarchy=DESA_KELOMPOK):
+        if user and user.get('role') == 'super_admin':
+            return cls(ALL_DESA, ALL_KELOMPOK, unrestricted=True, hierarchy=hierarchy)
+        
+        accessible_areas = accessible_areas or {}
+        desa = accessible_areas.get('desa') or []
+        kelompok = accessible_areas.get('kelompok') or []
+        
+        merged = {name: list(members) for name, members in hierarchy.items()}
+        if len(desa) == 1:
+            # Every kelompok of a single-desa account belongs to that desa
+            members = merged.setdefault(desa[0], [])
+            known = set(members)
+            for name in kelompok:
+                if name not in known:
+                    members.append(name)
+                    known.add(name)
+        
+        return cls(desa, kelompok, hierarchy=merged)
+    
+    def can_access_desa(self, desa_name):
+        return self.unrestricted or desa_name in self.desa_set
+    
+    def can_access_kelompok(self, kelompok_name):
+        return self.unrestricted or kelompok_name in self.kelompok_set
+    
+    def filter_desa(self, desa_list):
+        """Keep accessible desa in input order; an empty assignment allows all"""
+        if not self.desa_set:
+            return desa_list
+        
+        allowed = self.desa_set
+        return [desa for desa in desa_list if desa in allowed]
+    
+    def filter_kelompok(self, kelompok_list):
+        """Keep accessible kelompok in input order; an empty assignment allows all"""
+        if not self.kelompok_set:
+            return kelompok_list
+        
+        allowed = self.kelompok_set
+        return [kelompok for kelompok in kelompok_list if kelompok in allowed]
+    
+    def kelompok_of_desa(self, desa_name):
+        return self.kelompok_by_desa.get(desa_name, ())
+    
+    def desa_of_kelompok(self, kelompok_name):
+        return self.desa_by_kelompok.get(kelompok_name)
+    
+    def row_mask(self, desa_values, kelompok_values=None):
+        """Vectorized can_access_participant_data over whole columns.
+        
+        Accepts lists, NumPy arrays or pandas Series and returns a mask of the
+        same kind. Empty values are not checked, as in the per-row method.
+        """
+        if kelompok_values is not None and len(kelompok_values) != len(desa_values):
+            raise ValueError("desa and kelompok columns must have the same length")
+        
+        if hasattr(desa_values, 'isin'):
+            mask = self._array_mask(desa_values, kelompok_values)
+            return type(desa_values)(mask, index=desa_values.index)
+        
+        if type(desa_values).__module__ == 'numpy':
+            return self._array_mask(desa_values, kelompok_values)
+        
+        if self.unrestricted:
+            return [True] * len(desa_values)
+        
+        # Strings are tested inline; is_missing() only sees the other denied values
+        desa_set = self.desa_set
+        if kelompok_values is None:
+            return [desa in desa_set or (not desa if type(desa) is str else is_missing(desa))
+                    for desa in desa_values]
+        
+        kelompok_set = self.kelompok_set
+        return [
+            (desa in desa_set or (not desa if type(desa) is str else is_missing(desa)))
+            and (kelompok in kelompok_set or (not kelompok if type(kelompok) is str else is_missing(kelompok)))
+            for desa, kelompok in zip(desa_values, kelompok_values)
+        ]
+    
+    def _array_mask(self, desa_values, kelompok_values):
+        import numpy as np
+        
+        if self.unrestricted:
+            return np.ones(len(desa_values), dtype=bool)
+        
+        mask = _column_mask(desa_values, self.desa_set)
+        if kelompok_values is not None:
+            mask &= _column_mask(kelompok_values, self.kelompok_set)
+        return mask
+    
+    def iter_allowed_rows(self, rows, desa_key='desa', kelompok_key='kelompok', chunk_size=5000):
+        """Lazily yield the rows (dicts or sequences) whose area is accessible"""
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                return
+            
+            mask = self.row_mask([row[desa_key] for row in chunk],
+                                 [row[kelompok_key] for row in chunk])
+            for row, allowed in zip(chunk, mask):
+                if allowed:
+                    yield row
\ No newline at end of file
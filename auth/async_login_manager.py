@@ -0,0 +1,46 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncLoginManager:
+    """asyncio front end mirroring LoginManager's network API.
+    
+    State lives in the wrapped LoginManager. Its blocking HTTP calls run on a
+    small reusable worker pool sharing the pooled transport, so a connection
+    probe, a verify and a permission fetch can be awaited concurrently from
+    one event loop.
+    """
+    
+    def __init__(self, login_manager, max_workers=4):
+        self.login_manager = login_manager
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='auth-io')
+    
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+    
+    async def login(self, username, password):
+        return await self._run(self.login_manager.login, username, password)
+    
+    async def verify_token(self):
+        return await self._run(self.login_manager.verify_token)
+    
+    async def refresh_access_token(self):
+        return await self._run(self.login_manager.refresh_access_token)
+    
+    async def load_permissions(self):
+        """Fetch permissions now; returns True when the snapshot changed"""
+        return await self._run(self.login_manager.revalidate_permissions, background=False)
+    
+    async def is_logged_in(self):
+        return await self._run(self.login_manager.is_logged_in)
+    
+    async def check_connection(self):
+        return await self._run(self.login_manager.transport.probe)
+    
+    async def logout(self):
+        return await self._run(self.login_manager.logout)
+    
+    def close(self):
+        self._executor.shutdown(wait=False)
\ No newline at end of file
@@ -0,0 +1,104 @@
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling the API while the breaker is open"""
+
+
+class CircuitBreaker:
+    """Fail fast after repeated connection failures and probe for recovery.
+    
+    After `failure_threshold` consecutive failures the breaker opens: calls
+    are rejected immediately and `probe` is retried every `probe_interval`
+    seconds on a background thread until the server answers again. Without a
+    probe, one trial call is let through after `reset_timeout` seconds.
+    """
+    
+    def __init__(self, failure_threshold=3, reset_timeout=30, probe=None, probe_interval=10):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self.probe_interval = probe_interval
+        
+        self.state = CLOSED
+        self.failure_count = 0
+        self.last_call_failed = False
+        self.opened_at = None
+        self.listeners = []
+        
+        self._lock = threading.Lock()
+        self._probe_thread = None
+    
+    def is_open(self):
+        return self.state != CLOSED
+    
+    def allow_request(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                return True  # Single trial call
+            
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            previous = self.state
+            self.state = CLOSED
+            self.failure_count = 0
+            self.last_call_failed = False
+            self.opened_at = None
+        
+        if previous != CLOSED:
+            self._notify(CLOSED)
+    
+    def record_failure(self):
+        with self._lock:
+            self.failure_count += 1
+            self.last_call_failed = True
+            should_open = self.state == HALF_OPEN or (
+                self.state == CLOSED and self.failure_count >= self.failure_threshold
+            )
+            if should_open:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+        
+        if should_open:
+            self._notify(OPEN)
+            self._start_probe()
+    
+    def _start_probe(self):
+        if not self.probe:
+            return
+        
+        with self._lock:
+            if self._probe_thread and self._probe_thread.is_alive():
+                return
+            self._probe_thread = threading.Thread(target=self._probe_loop, name='auth-probe', daemon=True)
+            self._probe_thread.start()
+    
+    def _probe_loop(self):
+        while self.state != CLOSED:
+            time.sleep(self.probe_interval)
+            try:
+                reachable = self.probe()
+            except Exception:
+                reachable = False
+            
+            if reachable:
+                self.record_success()
+                return
+    
+    def _notify(self, state):
+        for listener in list(self.listeners):
+            try:
+                listener(state)
+            except Exception as e:
+                print(f"Error in circuit breaker listener: {e}")
\ No newline at end of file
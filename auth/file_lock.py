@@ -0,0 +1,75 @@
+import os
+import threading
+import time
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """Cross-process exclusive lock on a lock file, re-entrant within a process"""
+    
+    def __init__(self, path, timeout=15, poll_interval=0.05):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._handle = None
+    
+    def acquire(self):
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Timed out waiting for {self.path}")
+        
+        if self._depth == 0:
+            try:
+                self._handle = self._lock_file()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        
+        self._depth += 1
+        return self
+    
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            self._unlock_file(self._handle)
+            self._handle = None
+        self._thread_lock.release()
+    
+    def __enter__(self):
+        return self.acquire()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+    
+    def _lock_file(self):
+        handle = open(self.path, 'a+b')
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if os.name == 'nt':
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return handle
+            except OSError:
+                if time.monotonic() >= deadline:
+                    handle.close()
+                    raise TimeoutError(f"Timed out waiting for {self.path}")
+                time.sleep(self.poll_interval)
+    
+    @staticmethod
+    def _unlock_file(handle):
+        try:
+            if os.name == 'nt':
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            handle.close()
\ No newline at end of file
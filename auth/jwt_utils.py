@@ -0,0 +1,107 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+HMAC_ALGORITHMS = {
+    'HS256': hashlib.sha256,
+    'HS384': hashlib.sha384,
+    'HS512': hashlib.sha512
+}
+
+RSA_ALGORITHMS = ('RS256', 'RS384', 'RS512')
+
+
+def _b64url_decode(segment):
+    padding = '=' * (-len(segment) % 4)
+    return base64.urlsafe_b64decode(segment + padding)
+
+
+def split_token(token):
+    """Split a compact JWT into decoded header, claims and raw parts"""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split('.')
+        header = json.loads(_b64url_decode(header_b64))
+        claims = json.loads(_b64url_decode(payload_b64))
+    except (AttributeError, ValueError, TypeError):
+        return None
+    
+    if not isinstance(header, dict) or not isinstance(claims, dict):
+        return None
+    
+    return header, claims, (header_b64, payload_b64, signature_b64)
+
+
+def decode_claims(token):
+    """Decode JWT claims without checking the signature"""
+    parts = split_token(token)
+    if not parts:
+        return None
+    
+    return parts[1]
+
+
+def verify_signature(token, key):
+    """Check a JWT signature against a PEM public key (or an HMAC secret, server side only)"""
+    parts = split_token(token)
+    if not parts:
+        return False
+    
+    header, _, (header_b64, payload_b64, signature_b64) = parts
+    algorithm = header.get('alg')
+    signing_input = f"{header_b64}.{payload_b64}".encode()
+    
+    try:
+        signature = _b64url_decode(signature_b64)
+    except ValueError:
+        return False
+    
+    if isinstance(key, str):
+        key = key.encode()
+    
+    if algorithm in HMAC_ALGORITHMS:
+        expected = hmac.new(key, signing_input, HMAC_ALGORITHMS[algorithm]).digest()
+        return hmac.compare_digest(expected, signature)
+    
+    if algorithm in RSA_ALGORITHMS:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import padding
+        
+        digest = {'RS256': hashes.SHA256, 'RS384': hashes.SHA384, 'RS512': hashes.SHA512}[algorithm]
+        try:
+            public_key = serialization.load_pem_public_key(key)
+            public_key.verify(signature, signing_input, padding.PKCS1v15(), digest())
+            return True
+        except (InvalidSignature, ValueError, TypeError):
+            return False
+    
+    return False
+
+
+def seconds_until_expiry(claims, now=None):
+    """Seconds left before the `exp` claim, or None if the token has no expiry"""
+    exp = claims.get('exp') if claims else None
+    if not isinstance(exp, (int, float)):
+        return None
+    
+    return exp - (now if now is not None else time.time())
+
+
+def clock_offset(claims, now=None):
+    """Server minus local clock, estimated from the `iat` of a token just received"""
+    iat = claims.get('iat') if claims else None
+    if not isinstance(iat, (int, float)):
+        return None
+    
+    return iat - (now if now is not None else time.time())
+
+
+def issued_in_future(claims, leeway=30, now=None):
+    """True when the `iat` claim lies beyond the allowed clock skew"""
+    iat = claims.get('iat') if claims else None
+    if not isinstance(iat, (int, float)):
+        return False
+    
+    return iat > (now if now is not None else time.time()) + leeway
\ No newline at end of file
@@ -1,33 +1,148 @@
-import requests
+import hashlib
 import json
-import os
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime, timedelta
-from cryptography.fernet import Fernet
+
+from auth import jwt_utils
+from auth.area_index import AreaIndex
+from auth.circuit_breaker import CircuitOpenError
+from auth.permission_diff import PermissionDiff
+from auth.permission_matrix import PermissionMatrix
+from auth.role_defaults import DESA_KELOMPOK
+from auth.refresh_scheduler import REFRESH_REJECTED, REFRESH_UNREACHABLE, RefreshScheduler
+from auth.singleflight import SingleFlight
+from auth.startup import run_startup_pipeline
+from auth.token_store import MemoryTokenStore, SplitFileTokenStore
+from auth.transport import AuthTransport
+
+# Results of checking the access token without contacting the server
+TOKEN_VALID = 'valid'
+TOKEN_REVALIDATE = 'revalidate'
+TOKEN_EXPIRING = 'expiring'
+TOKEN_INVALID = 'invalid'
+
+# Returned by _fetch_permissions when the server answered 304
+PERMISSIONS_NOT_MODIFIED = 'not_modified'
+
+def permissions_hash(permissions, accessible_areas):
+    """Stable content hash of a permission snapshot"""
+    payload = json.dumps({'permissions': permissions, 'accessible_areas': accessible_areas},
+                         sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
 
 class LoginManager:
-    def __init__(self, api_base_url="https://adminweb-apps.vercel.app"):
+    def __init__(self, api_base_url="https://adminweb-apps.vercel.app",
+                 local_validation=True, token_verify_key=None,
+                 revalidate_interval=300, expiry_margin=60, transport=None,
+                 offline_grace_period=8 * 3600, revalidate_permissions_on_start=True,
+                 lazy_start=False, token_file="auth_tokens.dat", key_file="auth.key",
+                 token_store=None, network_check_timeout=5, permission_retry_delays=(5, 30, 120, 300)):
         self.api_base_url = api_base_url
-        self.token_file = "auth_tokens.dat"
-        self.key_file = "auth.key"
+        self.transport = transport or AuthTransport(api_base_url)
+        # Shared with the transport; see AuthMetrics.snapshot()/to_prometheus()
+        self.metrics = self.transport.metrics
+        # token_file=None keeps the session in memory only
+        self.token_file = token_file
+        self.key_file = key_file
+        if token_store is None:
+            token_store = SplitFileTokenStore(token_file, key_file) if token_file else MemoryTokenStore()
+        self.token_store = token_store
+        # Guards the stored tokens across app instances; concurrent verify/refresh
+        # calls within this process share one request.
+        self._token_lock = token_store.lock
+        self._flight = SingleFlight()
         self.current_user = None
         self.access_token = None
         self.refresh_token = None
         self.permissions = {}
         self.accessible_areas = {}
+        # Version of the permission snapshot: server ETag and local content hash
+        self.permissions_etag = None
+        self.permissions_hash = None
+        self.permission_matrix = PermissionMatrix.compile({})
+        self.area_index = AreaIndex.build(None, {})
+        # 'server' once a permission snapshot was received, 'role_defaults'
+        # while serving the schema.sql defaults of the user's role instead
+        self.permissions_source = None
+        # Bumped whenever the user or their permissions change; caches compare against it
+        self.session_generation = 0
+        # Called with a PermissionDiff whenever allowed actions or areas change
+        self.permission_listeners = []
+        self._hold_permission_diffs = False
+        # While the role defaults are served online, the permission fetch is
+        # retried in the background after these delays (the last one repeats)
+        self.permission_retry_delays = permission_retry_delays
+        self._permission_retry = None
+        self._permission_retry_attempt = 0
+        self._permission_retry_lock = threading.Lock()
         
-        self._init_encryption()
-        self._load_tokens()
-    
-    def _init_encryption(self):
-        if os.path.exists(self.key_file):
-            with open(self.key_file, 'rb') as f:
-                self.key = f.read()
+        # Local token validation: `token_verify_key` is a PEM public key (RS256);
+        # without it only the exp/iat claims are checked locally. Never ship the
+        # server's HMAC JWT_SECRET here: anyone holding it can mint tokens the
+        # API accepts.
+        self.local_validation = local_validation
+        self.token_verify_key = token_verify_key
+        self.revalidate_interval = revalidate_interval
+        self.expiry_margin = expiry_margin
+        self._last_verified_at = None
+        self._token_check_cache = None
+        # Server clock minus local clock, measured from the `iat` of received
+        # tokens; a client clock that is off must not make tokens look
+        # tampered with or expired.
+        self.clock_offset = 0.0
+        
+        # While the server is unreachable the cached session stays usable for
+        # `offline_grace_period` seconds after it was last confirmed online.
+        self.offline_grace_period = offline_grace_period
+        self.validated_at = None
+        # Upper bound in seconds for the verify/refresh calls of one is_logged_in()
+        self.network_check_timeout = network_check_timeout
+        
+        # Proactive refresh, enabled with start_auto_refresh()
+        self.refresh_scheduler = None
+        # Why the last refresh failed: REFRESH_REJECTED (the server refused the
+        # refresh token, retrying is pointless) or REFRESH_UNREACHABLE; None after a success
+        self.last_refresh_failure = None
+        self.on_refresh_success = None
+        self.on_refresh_failure = None
+        
+        # Key loading and token decryption; with lazy_start they run on a
+        # background thread and `ready` resolves once the session is usable.
+        self.revalidate_permissions_on_start = revalidate_permissions_on_start
+        self.ready = Future()
+        self.startup_check = Future()
+        self._started = False
+        if lazy_start:
+            threading.Thread(target=self._startup, name='auth-startup', daemon=True).start()
         else:
-            self.key = Fernet.generate_key()
-            with open(self.key_file, 'wb') as f:
-                f.write(self.key)
+            self._startup()
+            self.ready.result()
+    
+    def _startup(self):
+        try:
+            self._load_tokens()
+        except BaseException as e:
+            self.ready.set_exception(e)
+            return
         
-        self.cipher = Fernet(self.key)
+        self._started = True
+        self.ready.set_result(self)
+        
+        # Serve the cached snapshot now and check it against the server in the background
+        if self.revalidate_permissions_on_start and self.access_token:
+            threading.Thread(target=self._run_startup_check, name='auth-startup-check', daemon=True).start()
+    
+    def _run_startup_check(self):
+        try:
+            self.startup_check.set_result(run_startup_pipeline(self))
+        except BaseException as e:
+            self.startup_check.set_exception(e)
+    
+    def _wait_ready(self):
+        if not self._started:
+            self.ready.result()
     
     def _save_tokens(self):
         if self.access_token and self.refresh_token:
@@ -37,35 +152,91 @@ class LoginManager:
                 'user': self.current_user,
                 'permissions': self.permissions,
                 'accessible_areas': self.accessible_areas,
+                'permissions_etag': self.permissions_etag,
+                'permissions_hash': self.permissions_hash,
+                'validated_at': self.validated_at,
+                'clock_offset': self.clock_offset,
                 'saved_at': datetime.now().isoformat()
             }
             
-            encrypted_data = self.cipher.encrypt(json.dumps(token_data).encode())
-            with open(self.token_file, 'wb') as f:
-                f.write(encrypted_data)
+            self.token_store.save(token_data)
     
     def _load_tokens(self):
-        if os.path.exists(self.token_file):
-            try:
-                with open(self.token_file, 'rb') as f:
-                    encrypted_data = f.read()
-                
-                decrypted_data = self.cipher.decrypt(encrypted_data)
-                token_data = json.loads(decrypted_data.decode())
-                
-                self.access_token = token_data.get('access_token')
-                self.refresh_token = token_data.get('refresh_token')
-                self.current_user = token_data.get('user')
-                self.permissions = token_data.get('permissions', {})
-                self.accessible_areas = token_data.get('accessible_areas', {})
+        try:
+            token_data = self.token_store.load()
+            if not token_data:
+                return
+            
+            self.access_token = token_data.get('access_token')
+            self.refresh_token = token_data.get('refresh_token')
+            self.current_user = token_data.get('user')
+            self.permissions = token_data.get('permissions', {})
+            self.accessible_areas = token_data.get('accessible_areas', {})
+            self.validated_at = token_data.get('validated_at')
+            self.clock_offset = token_data.get('clock_offset') or 0.0
+            self.permissions_etag = token_data.get('permissions_etag')
+            self.permissions_hash = token_data.get('permissions_hash')
+            if self.permissions_hash is None and 'permissions' in token_data:
+                self.permissions_hash = permissions_hash(self.permissions, self.accessible_areas)
+            self._rebuild_permission_state()
+            
+            saved_at = datetime.fromisoformat(token_data.get('saved_at'))
+            if datetime.now() - saved_at > timedelta(days=6):
+                self._clear_tokens()
                 
-                saved_at = datetime.fromisoformat(token_data.get('saved_at'))
-                if datetime.now() - saved_at > timedelta(days=6):
-                    self._clear_tokens()
-                    
+        except Exception as e:
+            self.metrics.report_error('loading tokens', e)
+            self._clear_tokens()
+    
+    def _rebuild_permission_state(self):
+        """Recompile lookup structures after permissions or the user change"""
+        previous = (self.permission_matrix, self.area_index)
+        if self.permissions_hash is None and self.current_user:
+            # No server snapshot yet, or offline without one: serve the role
+            # defaults and the areas assigned in the user record meanwhile
+            user = self.current_user
+            self.permission_matrix = PermissionMatrix.for_role(user.get('role'))
+            self.area_index = AreaIndex.build(user, {
+                'desa': user.get('assigned_desa') or [],
+                'kelompok': user.get('assigned_kelompok') or []
+            }, hierarchy=DESA_KELOMPOK)
+            self.permissions_source = 'role_defaults'
+        else:
+            self.permission_matrix = PermissionMatrix.compile(self.permissions)
+            self.area_index = AreaIndex.build(self.current_user, self.accessible_areas, hierarchy=DESA_KELOMPOK)
+            self.permissions_source = 'server' if self.permissions_hash else None
+        self.session_generation += 1
+        
+        if not self._hold_permission_diffs:
+            self._publish_permission_changes(previous)
+    
+    def _publish_permission_changes(self, previous):
+        """Publish the diff from `previous` (matrix, area index) to the current state"""
+        if self.permission_listeners:
+            diff = PermissionDiff.between(previous[0], previous[1], self.permission_matrix,
+                                          self.area_index, self.session_generation)
+            if diff:
+                self._publish_permission_diff(diff)
+    
+    def add_permission_listener(self, listener):
+        """Call `listener(diff)` with a PermissionDiff on every permission change.
+        
+        Listeners run on the thread that applied the change, often a
+        background revalidation; Tk code should hand the diff back with
+        root.after().
+        """
+        self.permission_listeners.append(listener)
+    
+    def remove_permission_listener(self, listener):
+        if listener in self.permission_listeners:
+            self.permission_listeners.remove(listener)
+    
+    def _publish_permission_diff(self, diff):
+        for listener in list(self.permission_listeners):
+            try:
+                listener(diff)
             except Exception as e:
-                print(f"Error loading tokens: {e}")
-                self._clear_tokens()
+                self.metrics.report_error('in permission listener', e)
     
     def _clear_tokens(self):
         self.access_token = None
@@ -73,32 +244,62 @@ class LoginManager:
         self.current_user = None
         self.permissions = {}
         self.accessible_areas = {}
+        self.permissions_etag = None
+        self.permissions_hash = None
+        self._rebuild_permission_state()
+        self._last_verified_at = None
+        self._token_check_cache = None
+        self.validated_at = None
+        self._cancel_permission_retry()
+        
+        if self.refresh_scheduler:
+            self.refresh_scheduler.unschedule(self)
         
-        if os.path.exists(self.token_file):
-            os.remove(self.token_file)
+        self.token_store.clear()
     
     def login(self, username, password):
+        import requests
+        
+        self._wait_ready()
         try:
-            response = requests.post(
-                f"{self.api_base_url}/api/auth/login",
+            response = self.transport.post(
+                'login',
                 json={
                     'username': username,
                     'password': password,
                     'device_type': 'desktop',
                     'device_info': 'Python Tkinter App'
-                },
-                timeout=10
+                }
             )
             
             if response.status_code == 200:
                 data = response.json()
                 if data.get('success'):
-                    self.access_token = data['data']['access_token']
-                    self.refresh_token = data['data']['refresh_token']
-                    self.current_user = data['data']['user']
-                    
-                    self._load_permissions()
+                    # Listeners get one diff, from the previous session to the
+                    # fetched permissions (or the role defaults if the fetch fails)
+                    previous = (self.permission_matrix, self.area_index)
+                    self._hold_permission_diffs = True
+                    try:
+                        self.access_token = data['data']['access_token']
+                        self.refresh_token = data['data']['refresh_token']
+                        self.current_user = data['data']['user']
+                        self._measure_clock_offset()
+                        # Permissions of a previous session must not carry over
+                        self.permissions = {}
+                        self.accessible_areas = {}
+                        self.permissions_etag = None
+                        self.permissions_hash = None
+                        self._mark_verified()
+                        self._rebuild_permission_state()
+                        
+                        self._load_permissions()
+                    finally:
+                        self._hold_permission_diffs = False
+                    self._publish_permission_changes(previous)
                     self._save_tokens()
+                    self._reschedule_refresh()
+                    self._permission_retry_attempt = 0
+                    self._schedule_permission_retry()
                     
                     return True, "Login berhasil"
                 else:
@@ -109,134 +310,404 @@ class LoginManager:
                 
         except requests.exceptions.Timeout:
             return False, "Koneksi timeout. Periksa koneksi internet Anda."
-        except requests.exceptions.ConnectionError:
+        except (requests.exceptions.ConnectionError, CircuitOpenError):
             return False, "Tidak dapat terhubung ke server. Periksa koneksi internet Anda."
         except Exception as e:
             return False, f"Error: {str(e)}"
     
     def _load_permissions(self):
+        """Fetch permissions; returns True when the snapshot actually changed"""
         if not self.access_token:
-            return
+            return False
+        
+        return self._apply_fetched_permissions(self._fetch_permissions(self.access_token))
+    
+    def _fetch_permissions(self, access_token):
+        """GET permissions for a token without applying them; None on failure"""
+        headers = {'Authorization': f'Bearer {access_token}'}
+        if self.permissions_etag and self.permissions_hash:
+            headers['If-None-Match'] = self.permissions_etag
         
         try:
-            response = requests.get(
-                f"{self.api_base_url}/api/user/permissions",
-                headers={'Authorization': f'Bearer {self.access_token}'},
-                timeout=10
-            )
+            response = self.transport.get('permissions', headers=headers)
+            
+            if response.status_code == 304:
+                return PERMISSIONS_NOT_MODIFIED
             
             if response.status_code == 200:
                 data = response.json()
                 if data.get('success'):
-                    self.permissions = data['data']['permissions']
-                    self.accessible_areas = data['data']['accessible_areas']
+                    return {
+                        'etag': response.headers.get('ETag'),
+                        'permissions': data['data']['permissions'],
+                        'accessible_areas': data['data']['accessible_areas']
+                    }
                     
         except Exception as e:
-            print(f"Error loading permissions: {e}")
+            self.metrics.report_error('loading permissions', e)
+        
+        return None
+    
+    def _apply_fetched_permissions(self, fetched):
+        if not fetched or fetched == PERMISSIONS_NOT_MODIFIED:
+            return False
+        
+        self.permissions_etag = fetched['etag']
+        return self._apply_permissions(fetched['permissions'], fetched['accessible_areas'])
     
-    def verify_token(self):
+    def _apply_permissions(self, permissions, accessible_areas):
+        snapshot_hash = permissions_hash(permissions, accessible_areas)
+        if snapshot_hash == self.permissions_hash:
+            return False
+        
+        self.permissions = permissions
+        self.accessible_areas = accessible_areas
+        self.permissions_hash = snapshot_hash
+        self._rebuild_permission_state()
+        return True
+    
+    def revalidate_permissions(self, background=True):
+        """Check the cached permission snapshot against the server.
+        
+        The cached snapshot keeps serving checks meanwhile; derived state is
+        only rebuilt and saved when the payload changed.
+        """
+        self._wait_ready()
+        if not background:
+            return self._revalidate_permissions()
+        
+        threading.Thread(target=self._revalidate_permissions, daemon=True).start()
+    
+    def _revalidate_permissions(self):
+        if not self.is_logged_in():
+            return False
+        
+        changed = self._flight.do('permissions', self._load_permissions)
+        if changed:
+            self._save_tokens()
+        return changed
+    
+    def _schedule_permission_retry(self):
+        """Fetch the server snapshot later while the role defaults stand in for it"""
+        if self.permissions_source != 'role_defaults' or not self.access_token:
+            return
+        # Offline the defaults are expected; a successful refresh schedules again
+        if self.transport.circuit_breaker.is_open():
+            return
+        
+        with self._permission_retry_lock:
+            if self._permission_retry is not None:
+                return
+            delays = self.permission_retry_delays
+            delay = delays[min(self._permission_retry_attempt, len(delays) - 1)]
+            self._permission_retry_attempt += 1
+            timer = threading.Timer(delay, self._retry_permissions)
+            timer.daemon = True
+            self._permission_retry = timer
+        timer.start()
+    
+    def _retry_permissions(self):
+        with self._permission_retry_lock:
+            self._permission_retry = None
+        
+        if self.permissions_source == 'role_defaults':
+            try:
+                self._revalidate_permissions()
+            except Exception as e:
+                self.metrics.report_error('retrying permissions', e)
+        
+        if self.permissions_source == 'role_defaults':
+            self._schedule_permission_retry()
+        else:
+            self._permission_retry_attempt = 0
+    
+    def _cancel_permission_retry(self):
+        with self._permission_retry_lock:
+            timer = self._permission_retry
+            self._permission_retry = None
+            self._permission_retry_attempt = 0
+        if timer:
+            timer.cancel()
+    
+    def verify_token(self, max_time=None):
+        self._wait_ready()
         if not self.access_token:
             return False
         
+        return self._flight.do(('verify', self.access_token), self._verify_token, max_time)
+    
+    def _verify_token(self, max_time=None):
         try:
-            response = requests.get(
-                f"{self.api_base_url}/api/auth/verify",
+            response = self.transport.get(
+                'verify',
                 headers={'Authorization': f'Bearer {self.access_token}'},
-                timeout=10
+                max_time=max_time
             )
             
-            return response.status_code == 200 and response.json().get('valid', False)
+            valid = response.status_code == 200 and response.json().get('valid', False)
+            if valid:
+                self._mark_verified()
+            return valid
             
         except Exception:
             return False
     
-    def refresh_access_token(self):
+    def server_time(self):
+        """Current time on the server's clock, as far as it is known"""
+        return time.time() + self.clock_offset
+    
+    def token_seconds_remaining(self, token=None):
+        """Seconds until an access token (the current one by default) expires, or None"""
+        claims = jwt_utils.decode_claims(token or self.access_token)
+        return jwt_utils.seconds_until_expiry(claims, now=self.server_time())
+    
+    def _measure_clock_offset(self, claims=None):
+        offset = jwt_utils.clock_offset(claims or jwt_utils.decode_claims(self.access_token))
+        if offset is not None:
+            self.clock_offset = offset
+    
+    def _mark_verified(self):
+        self._last_verified_at = time.monotonic()
+        self.validated_at = time.time()
+    
+    def is_offline(self):
+        """True while the circuit breaker considers the server unreachable"""
+        return self.transport.circuit_breaker.is_open()
+    
+    def has_offline_session(self):
+        """True if the cached session may be used without the server"""
+        if not (self.access_token and self.refresh_token and self.validated_at):
+            return False
+        
+        return time.time() - self.validated_at <= self.offline_grace_period
+    
+    def _check_token_locally(self):
+        """Classify the access token from its claims without a network call"""
+        token = self.access_token
+        cached = self._token_check_cache
+        if cached and cached[0] == token:
+            claims, signature_ok = cached[1], cached[2]
+        else:
+            claims = jwt_utils.decode_claims(token)
+            signature_ok = True
+            if claims is not None and self.token_verify_key:
+                signature_ok = jwt_utils.verify_signature(token, self.token_verify_key)
+            self._token_check_cache = (token, claims, signature_ok)
+        
+        if claims is None:
+            return TOKEN_REVALIDATE
+        
+        if not signature_ok:
+            return TOKEN_INVALID
+        
+        if jwt_utils.issued_in_future(claims, now=self.server_time()):
+            # Only the server issues tokens, so this is clock skew (e.g. a
+            # token saved before the offset was known), not tampering
+            self._measure_clock_offset(claims)
+        
+        remaining = jwt_utils.seconds_until_expiry(claims, now=self.server_time())
+        if remaining is not None and remaining <= self.expiry_margin:
+            return TOKEN_EXPIRING
+        
+        if self._last_verified_at is None:
+            return TOKEN_REVALIDATE
+        
+        if time.monotonic() - self._last_verified_at >= self.revalidate_interval:
+            return TOKEN_REVALIDATE
+        
+        return TOKEN_VALID
+    
+    def refresh_access_token(self, max_time=None):
+        self._wait_ready()
         if not self.refresh_token:
             return False
         
+        return self._flight.do('refresh', self._refresh_access_token, max_time)
+    
+    def _refresh_access_token(self, max_time=None):
         try:
-            response = requests.post(
-                f"{self.api_base_url}/api/auth/refresh",
-                json={'refresh_token': self.refresh_token},
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success'):
-                    self.access_token = data['data']['access_token']
-                    self.current_user = data['data']['user']
-                    self._save_tokens()
+            with self._token_lock:
+                # Another app instance may already have refreshed the shared token file
+                if self._adopt_stored_tokens():
+                    self.last_refresh_failure = None
                     return True
+                
+                response = self.transport.post(
+                    'refresh',
+                    json={'refresh_token': self.refresh_token},
+                    max_time=max_time
+                )
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    if data.get('success'):
+                        self.access_token = data['data']['access_token']
+                        self.current_user = data['data']['user']
+                        self._measure_clock_offset()
+                        self._mark_verified()
+                        self._rebuild_permission_state()
+                        self._save_tokens()
+                        self._reschedule_refresh()
+                        self.last_refresh_failure = None
+                        self._schedule_permission_retry()
+                        return True
+                
+                # An answered 4xx (or a 200 without success) is a verdict on the
+                # refresh token; 5xx, 408 and 429 may pass on a later attempt
+                status = response.status_code
+                if status < 500 and status not in (408, 429):
+                    self.last_refresh_failure = REFRESH_REJECTED
+                    return False
                     
         except Exception as e:
-            print(f"Error refreshing token: {e}")
+            self.metrics.report_error('refreshing token', e)
         
+        self.last_refresh_failure = REFRESH_UNREACHABLE
         return False
     
+    def _adopt_stored_tokens(self):
+        """Take over a newer access token another process saved for this session"""
+        try:
+            token_data = self.token_store.load()
+        except Exception:
+            return False
+        
+        if not token_data:
+            return False
+        
+        stored_token = token_data.get('access_token')
+        if not stored_token or stored_token == self.access_token:
+            return False
+        if token_data.get('refresh_token') != self.refresh_token:
+            return False
+        
+        stored_remaining = self.token_seconds_remaining(stored_token)
+        if stored_remaining is None or stored_remaining <= self.expiry_margin:
+            return False
+        
+        current_remaining = self.token_seconds_remaining()
+        if current_remaining is not None and current_remaining >= stored_remaining:
+            return False
+        
+        self.access_token = stored_token
+        self.current_user = token_data.get('user') or self.current_user
+        self._mark_verified()
+        self._rebuild_permission_state()
+        self._reschedule_refresh()
+        return True
+    
+    def start_auto_refresh(self, on_success=None, on_failure=None, scheduler=None):
+        """Refresh the access token in the background before it expires.
+        
+        Callbacks receive this LoginManager and run on the scheduler thread;
+        Tk code should hand results back with root.after().
+        """
+        self._wait_ready()
+        self.on_refresh_success = on_success
+        self.on_refresh_failure = on_failure
+        self.refresh_scheduler = scheduler or self.refresh_scheduler or RefreshScheduler()
+        self.refresh_scheduler.start()
+        self._reschedule_refresh()
+    
+    def stop_auto_refresh(self):
+        if self.refresh_scheduler:
+            self.refresh_scheduler.unschedule(self)
+    
+    def _reschedule_refresh(self):
+        if self.refresh_scheduler and self.access_token:
+            self.refresh_scheduler.schedule(self)
+    
+    def _run_scheduled_refresh(self):
+        success = self.refresh_access_token()
+        callback = self.on_refresh_success if success else self.on_refresh_failure
+        if callback:
+            try:
+                callback(self)
+            except Exception as e:
+                self.metrics.report_error('in token refresh callback', e)
+        return success
+    
     def logout(self):
+        self._wait_ready()
         self._clear_tokens()
         return True
     
     def is_logged_in(self):
+        self._wait_ready()
+        self.metrics.increment('is_logged_in_calls')
         if not self.access_token:
             return False
         
-        if self.verify_token():
-            return True
+        status = None
+        if self.local_validation:
+            status = self._check_token_locally()
+            if status == TOKEN_VALID:
+                return True
+            
+            # A tampered token is never accepted, not even offline
+            if status == TOKEN_INVALID:
+                self.metrics.increment('is_logged_in_network')
+                if self.refresh_access_token():
+                    return True
+                self._clear_tokens()
+                return False
+        
+        # Server known to be down: answer from the cached session instead of waiting
+        if self.is_offline():
+            return self.has_offline_session()
         
-        if self.refresh_access_token():
-            return True
+        self.metrics.increment('is_logged_in_network')
+        # An expiring token cannot pass /verify for long, go straight to refresh
+        if status == TOKEN_EXPIRING:
+            steps = (self.refresh_access_token, self.verify_token)
+        else:
+            steps = (self.verify_token, self.refresh_access_token)
+        
+        breaker = self.transport.circuit_breaker
+        deadline = time.monotonic() + self.network_check_timeout
+        for step in steps:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if step(max_time=remaining):
+                return True
+            if breaker.last_call_failed:
+                break  # Unreachable: do not wait for the next call as well
+        
+        if breaker.last_call_failed or time.monotonic() >= deadline:
+            # The server could not be reached in time; keep the session for offline use
+            return self.has_offline_session()
         
         self._clear_tokens()
         return False
     
     def get_current_user(self):
+        self._wait_ready()
         return self.current_user
     
     def has_permission(self, menu_name, action='view'):
-        if not self.permissions:
-            return False
-        
-        menu_perms = self.permissions.get(menu_name, {})
-        action_key = f'can_{action}'
-        return menu_perms.get(action_key, False)
+        self._wait_ready()
+        self.metrics.increment('permission_checks')
+        return self.permission_matrix.allows_name(menu_name, action)
     
     def can_access_desa(self, desa_name):
+        self._wait_ready()
         if not self.current_user:
             return False
         
-        if self.current_user.get('role') == 'super_admin':
-            return True
-        
-        assigned_desa = self.accessible_areas.get('desa', [])
-        return desa_name in assigned_desa
+        return self.area_index.can_access_desa(desa_name)
     
     def can_access_kelompok(self, kelompok_name):
+        self._wait_ready()
         if not self.current_user:
             return False
         
-        if self.current_user.get('role') == 'super_admin':
-            return True
-        
-        assigned_kelompok = self.accessible_areas.get('kelompok', [])
-        return kelompok_name in assigned_kelompok
+        return self.area_index.can_access_kelompok(kelompok_name)
     
     def get_accessible_desa(self):
-        if self.current_user and self.current_user.get('role') == 'super_admin':
-            return ['BANDARA', 'CENGKARENG', 'CIPONDOH', 'JELAMBAR', 'KALIDERES', 'KEBON JAHE', 'TAMAN KOTA', 'KAPUK MELATI']
-        
-        return self.accessible_areas.get('desa', [])
+        self._wait_ready()
+        return self.area_index.desa_list
     
     def get_accessible_kelompok(self):
-        if self.current_user and self.current_user.get('role') == 'super_admin':
-            return [
-                "TEGAL ALUR A", "TEGAL ALUR B", "PREPEDAN A", "PREPEDAN B", "KEBON KELAPA",
-                "PRIMA", "RAWA LELE", "KAMPUNG DURI", "FAJAR A", "FAJAR B", "FAJAR C",
-                "DAMAI", "JAYA", "INDAH", "PEJAGALAN", "BGN", "MELATI A", "MELATI B",
-                "GRIYA PERMATA", "SEMANAN A", "SEMANAN B", "PONDOK BAHAR",
-                "KEBON JAHE A", "KEBON JAHE B", "GARIKAS", "TANIWAN",
-                "TAMAN KOTA A", "TAMAN KOTA B", "RAWA BUAYA A", "RAWA BUAYA B"
-            ]
-        
-        return self.accessible_areas.get('kelompok', [])
\ No newline at end of file
+        self._wait_ready()
+        return self.area_index.kelompok_list
\ No newline at end of file
@@ -1,16 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
-from PIL import Image, ImageTk
 import os
 
+from auth.async_login_manager import AsyncLoginManager
+
 class LoginScreen:
-    def __init__(self, root, login_manager, on_success_callback):
+    def __init__(self, root, login_manager, on_success_callback, bridge=None, async_manager=None):
         self.root = root
         self.login_manager = login_manager
         self.on_success_callback = on_success_callback
         self.login_window = None
         self.is_logging_in = False
+        self.login_username = None
+        
+        # With a TkAsyncBridge, network work runs on its asyncio loop instead of new threads
+        self.bridge = bridge
+        self.async_manager = async_manager
+        if bridge and not async_manager:
+            self.async_manager = AsyncLoginManager(login_manager)
         
     def show_login(self):
         # Create login window
@@ -124,16 +132,29 @@ class LoginScreen:
     
     def check_connection(self):
         """Check connection to API server"""
+        if self.bridge:
+            self.bridge.submit(self.async_manager.check_connection(),
+                               on_done=self.show_connection_status,
+                               on_error=lambda e: self.show_connection_status(False))
+            return
+        
         def check():
-            try:
-                import requests
-                response = requests.get(f"{self.login_manager.api_base_url}/api/auth/verify", timeout=5)
-                self.connection_label.config(text="🟢 Terhubung ke server", fg='green')
-            except:
-                self.connection_label.config(text="🔴 Tidak dapat terhubung ke server", fg='red')
+            connected = self.login_manager.transport.probe()
+            # Widgets may only be touched from the Tk thread
+            self.root.after(0, lambda: self.show_connection_status(connected))
         
         threading.Thread(target=check, daemon=True).start()
     
+    def show_connection_status(self, connected):
+        """Update the connection label in the main thread"""
+        if not self.login_window:
+            return
+        
+        if connected:
+            self.connection_label.config(text="🟢 Terhubung ke server", fg='green')
+        else:
+            self.connection_label.config(text="🔴 Tidak dapat terhubung ke server", fg='red')
+    
     def perform_login(self):
         """Perform login process"""
         if self.is_logging_in:
@@ -147,10 +168,17 @@ class LoginScreen:
             return
         
         # Disable login button and show loading
+        self.login_username = username
         self.is_logging_in = True
         self.login_btn.config(state='disabled', text='Sedang masuk...')
         self.status_label.config(text="🔄 Memverifikasi kredensial...", fg='blue')
         
+        if self.bridge:
+            self.bridge.submit(self.async_manager.login(username, password),
+                               on_done=lambda result: self.handle_login_result(*result),
+                               on_error=lambda e: self.handle_login_result(False, f"Error: {e}"))
+            return
+        
         # Perform login in separate thread
         def login_thread():
             success, message = self.login_manager.login(username, password)
@@ -175,6 +203,16 @@ class LoginScreen:
             # Clear password field on error
             self.password_entry.delete(0, tk.END)
             self.password_entry.focus_set()
+            
+            # Offer the cached session when the server is unreachable, only to its own user
+            if (self.login_manager.is_offline() and self.login_manager.has_offline_session()
+                    and self.offline_session_matches(self.login_username)):
+                self.show_offline_mode_dialog()
+    
+    def offline_session_matches(self, username):
+        """True if the cached session belongs to the user who tried to log in"""
+        user = self.login_manager.current_user
+        return bool(user and username and user.get('username') == username)
     
     def close_and_continue(self):
         """Close login window and continue to main app"""
@@ -206,5 +244,5 @@ class LoginScreen:
             # Continue in offline mode
             self.close_and_continue()
         else:
-            # Exit application
-            self.root.quit()
\ No newline at end of file
+            # Back to the login form
+            self.password_entry.focus_set()
\ No newline at end of file
@@ -0,0 +1,163 @@
+import bisect
+import threading
+import time
+
+from auth import tracing
+
+# Latency histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SUCCESS = 'success'
+ERROR = 'error'
+TIMEOUT = 'timeout'
+REJECTED = 'rejected'  # Not sent because the circuit breaker is open
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def snapshot(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            buckets['+Inf' if bound == float('inf') else repr(bound)] = cumulative
+        return {'buckets': buckets, 'sum': self.sum, 'count': self.count}
+
+
+class AuthMetrics:
+    """Request latency, outcome and usage counters for the auth client.
+    
+    Listeners added with add_listener() receive every recorded event as a
+    dict, e.g. to forward them to structured logging.
+    """
+    
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.latency = {}
+        self.outcomes = {}
+        self.bytes_sent = {}
+        self.bytes_received = {}
+        self.counters = {}
+        self.listeners = []
+        self._lock = threading.Lock()
+    
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+    
+    def increment(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def observe_request(self, endpoint, method, outcome, elapsed, status=None,
+                        bytes_sent=0, bytes_received=0):
+        with self._lock:
+            histogram = self.latency.get(endpoint)
+            if histogram is None:
+                histogram = self.latency[endpoint] = Histogram(self.buckets)
+            histogram.observe(elapsed)
+            
+            key = (endpoint, outcome)
+            self.outcomes[key] = self.outcomes.get(key, 0) + 1
+            self.bytes_sent[endpoint] = self.bytes_sent.get(endpoint, 0) + bytes_sent
+            self.bytes_received[endpoint] = self.bytes_received.get(endpoint, 0) + bytes_received
+        
+        tracing.record_request(endpoint, method, outcome, elapsed, status)
+        
+        if self.listeners:
+            self.emit('request', endpoint=endpoint, method=method, outcome=outcome,
+                      status=status, elapsed=elapsed, bytes_sent=bytes_sent,
+                      bytes_received=bytes_received)
+    
+    def report_error(self, where, error):
+        """Record a handled failure; printed as before when nobody listens"""
+        self.increment('errors')
+        if self.listeners:
+            self.emit('error', where=where, error=str(error), error_type=type(error).__name__)
+        else:
+            print(f"Error {where}: {error}")
+    
+    def emit(self, event, **fields):
+        record = {'event': event, 'time': time.time()}
+        record.update(fields)
+        for listener in list(self.listeners):
+            try:
+                listener(record)
+            except Exception as e:
+                print(f"Error in metrics listener: {e}")
+    
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self.counters)
+            snapshot = {
+                'requests': {
+                    endpoint: {
+                        'latency': histogram.snapshot(),
+                        'outcomes': {
+                            outcome: count for (name, outcome), count in self.outcomes.items()
+                            if name == endpoint
+                        },
+                        'bytes_sent': self.bytes_sent.get(endpoint, 0),
+                        'bytes_received': self.bytes_received.get(endpoint, 0)
+                    }
+                    for endpoint, histogram in self.latency.items()
+                },
+                'counters': counters
+            }
+        
+        network_checks = counters.get('is_logged_in_network', 0)
+        lookups = counters.get('decision_cache_hits', 0) + counters.get('decision_cache_misses', 0)
+        # PermissionManager checks go through the decision cache
+        checks = counters.get('permission_checks', 0) + lookups
+        snapshot['derived'] = {
+            # How many permission checks one network-backed login check served
+            'checks_per_network_validation': checks / network_checks if network_checks else float(checks),
+            'decision_cache_hit_rate': counters.get('decision_cache_hits', 0) / lookups if lookups else 0.0
+        }
+        return snapshot
+    
+    def to_prometheus(self, prefix='auth_client'):
+        """Render the metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            name = f"{prefix}_request_duration_seconds"
+            lines.append(f"# HELP {name} Auth API request latency")
+            lines.append(f"# TYPE {name} histogram")
+            for endpoint, histogram in sorted(self.latency.items()):
+                data = histogram.snapshot()
+                for bound, count in data['buckets'].items():
+                    lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+                lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {data["sum"]}')
+                lines.append(f'{name}_count{{endpoint="{endpoint}"}} {data["count"]}')
+            
+            name = f"{prefix}_requests_total"
+            lines.append(f"# HELP {name} Auth API requests by outcome")
+            lines.append(f"# TYPE {name} counter")
+            for (endpoint, outcome), count in sorted(self.outcomes.items()):
+                lines.append(f'{name}{{endpoint="{endpoint}",outcome="{outcome}"}} {count}')
+            
+            for metric, values in (('bytes_sent', self.bytes_sent), ('bytes_received', self.bytes_received)):
+                name = f"{prefix}_{metric}_total"
+                lines.append(f"# TYPE {name} counter")
+                for endpoint, count in sorted(values.items()):
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {count}')
+            
+            for counter, count in sorted(self.counters.items()):
+                name = f"{prefix}_{counter}_total"
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {count}")
+        
+        return "\n".join(lines) + "\n"
\ No newline at end of file
@@ -0,0 +1,82 @@
+class PermissionDiff:
+    """What changed between two permission states of a LoginManager.
+    
+    `gained` and `lost` map menu keys to the actions (view/create/edit/
+    delete) that became allowed or were withdrawn; the area fields list
+    the desa and kelompok that became accessible or inaccessible.
+    """
+    
+    def __init__(self, gained=None, lost=None, desa_added=(), desa_removed=(),
+                 kelompok_added=(), kelompok_removed=(), generation=None):
+        self.gained = gained or {}
+        self.lost = lost or {}
+        self.desa_added = list(desa_added)
+        self.desa_removed = list(desa_removed)
+        self.kelompok_added = list(kelompok_added)
+        self.kelompok_removed = list(kelompok_removed)
+        # LoginManager.session_generation the diff leads to
+        self.generation = generation
+    
+    @classmethod
+    def between(cls, old_matrix, old_index, new_matrix, new_index, generation=None):
+        """Diff two (PermissionMatrix, AreaIndex) states"""
+        old_actions = old_matrix.allowed_actions()
+        new_actions = new_matrix.allowed_actions()
+        gained = {}
+        lost = {}
+        for menu_key in set(old_actions) | set(new_actions):
+            before = old_actions.get(menu_key, frozenset())
+            after = new_actions.get(menu_key, frozenset())
+            if after - before:
+                gained[menu_key] = after - before
+            if before - after:
+                lost[menu_key] = before - after
+        
+        def changes(old_list, new_list):
+            old_set = set(old_list)
+            new_set = set(new_list)
+            return ([name for name in new_list if name not in old_set],
+                    [name for name in old_list if name not in new_set])
+        
+        desa_added, desa_removed = changes(old_index.desa_list, new_index.desa_list)
+        kelompok_added, kelompok_removed = changes(old_index.kelompok_list, new_index.kelompok_list)
+        return cls(gained, lost, desa_added, desa_removed, kelompok_added, kelompok_removed, generation)
+    
+    def __bool__(self):
+        return bool(self.gained or self.lost or self.areas_changed)
+    
+    @property
+    def areas_changed(self):
+        return bool(self.desa_added or self.desa_removed or self.kelompok_added or self.kelompok_removed)
+    
+    @property
+    def changed_menus(self):
+        """Menu keys whose allowed actions changed"""
+        return set(self.gained) | set(self.lost)
+    
+    def affects_menu(self, menu_key, action=None):
+        if action is None:
+            return menu_key in self.gained or menu_key in self.lost
+        return action in self.gained.get(menu_key, ()) or action in self.lost.get(menu_key, ())
+    
+    def to_dict(self):
+        return {
+            'gained': {menu_key: sorted(actions) for menu_key, actions in self.gained.items()},
+            'lost': {menu_key: sorted(actions) for menu_key, actions in self.lost.items()},
+            'desa_added': self.desa_added,
+            'desa_removed': self.desa_removed,
+            'kelompok_added': self.kelompok_added,
+            'kelompok_removed': self.kelompok_removed,
+            'generation': self.generation
+        }
+    
+    def __repr__(self):
+        parts = []
+        for label, menus in (('+', self.gained), ('-', self.lost)):
+            for menu_key, actions in sorted(menus.items()):
+                parts.append(f"{label}{menu_key}:{','.join(sorted(actions))}")
+        for label, names in (('+desa', self.desa_added), ('-desa', self.desa_removed),
+                             ('+kelompok', self.kelompok_added), ('-kelompok', self.kelompok_removed)):
+            if names:
+                parts.append(f"{label}:{len(names)}")
+        return f"PermissionDiff({' '.join(parts) or 'no changes'})"
\ No newline at end of file
@@ -1,84 +1,138 @@
+from auth.area_index import denied_mask, is_missing
+from auth.permission_matrix import MENU_PERMISSIONS, actions_from_mask
+from auth.tracing import traced_check
+
 class PermissionManager:
     def __init__(self, login_manager):
         self.login_manager = login_manager
         
         # Define menu permissions mapping
-        self.menu_permissions = {
-            'dashboard': 'Dashboard',
-            'input_data': 'Input Data Muda-Mudi',
-            'manajemen_kegiatan': 'Manajemen Kegiatan',
-            'scan_qr': 'Scan QR Absensi',
-            'pencarian_data': 'Pencarian Data',
-            'laporan': 'Laporan',
-            'gabung_database': 'Gabung Database'
+        self.menu_permissions = MENU_PERMISSIONS
+        
+        # Decisions cached for one LoginManager.session_generation; a new
+        # generation (login, logout, refresh, permission reload) drops them all.
+        self.max_cached_decisions = 10000
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._decisions = {}
+        self._decisions_generation = None
+    
+    def _cached(self, method, key, compute, *args):
+        # `compute` must read the login manager's state itself, after the
+        # generation is read here: LoginManager assigns the new state before
+        # bumping the generation, so a decision computed while a rebuild
+        # lands is never stored under the new generation.
+        generation = self.login_manager.session_generation
+        if generation != self._decisions_generation:
+            self._decisions = {}
+            self._decisions_generation = generation
+        
+        cache_key = (method, key)
+        try:
+            value = self._decisions[cache_key]
+        except KeyError:
+            self.cache_misses += 1
+            self.login_manager.metrics.increment('decision_cache_misses')
+            decisions = self._decisions
+            if len(decisions) >= self.max_cached_decisions:
+                decisions = self._decisions = {}
+            value = compute(*args)
+            if self.login_manager.session_generation == generation:
+                decisions[cache_key] = value
+            return value
+        
+        self.cache_hits += 1
+        self.login_manager.metrics.increment('decision_cache_hits')
+        return value
+    
+    def get_permissions_source(self):
+        """'server', or 'role_defaults' while the schema.sql role defaults are served"""
+        return self.login_manager.permissions_source
+    
+    def get_cache_stats(self):
+        """Get decision cache counters"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0,
+            'size': len(self._decisions),
+            'generation': self._decisions_generation
         }
     
+    @traced_check
     def can_access_menu(self, menu_key):
         """Check if user can access a specific menu"""
         if not self.login_manager.is_logged_in():
             return False
         
-        menu_name = self.menu_permissions.get(menu_key)
-        if not menu_name:
-            return True  # Allow access to unmapped menus by default
-        
-        return self.login_manager.has_permission(menu_name, 'view')
+        return self._cached('view', (menu_key, self.menu_permissions.get(menu_key)), self._menu_allows,
+                            menu_key, 'view')
     
+    @traced_check
     def can_create_data(self, menu_key):
         """Check if user can create data in a specific menu"""
         if not self.login_manager.is_logged_in():
             return False
         
-        menu_name = self.menu_permissions.get(menu_key)
-        if not menu_name:
-            return True
-        
-        return self.login_manager.has_permission(menu_name, 'create')
+        return self._cached('create', (menu_key, self.menu_permissions.get(menu_key)), self._menu_allows,
+                            menu_key, 'create')
     
+    @traced_check
     def can_edit_data(self, menu_key):
         """Check if user can edit data in a specific menu"""
         if not self.login_manager.is_logged_in():
             return False
         
-        menu_name = self.menu_permissions.get(menu_key)
-        if not menu_name:
-            return True
-        
-        return self.login_manager.has_permission(menu_name, 'edit')
+        return self._cached('edit', (menu_key, self.menu_permissions.get(menu_key)), self._menu_allows,
+                            menu_key, 'edit')
     
+    @traced_check
     def can_delete_data(self, menu_key):
         """Check if user can delete data in a specific menu"""
         if not self.login_manager.is_logged_in():
             return False
         
+        return self._cached('delete', (menu_key, self.menu_permissions.get(menu_key)), self._menu_allows,
+                            menu_key, 'delete')
+    
+    def _menu_allows(self, menu_key, action):
         menu_name = self.menu_permissions.get(menu_key)
         if not menu_name:
-            return True
+            return True  # Allow access to unmapped menus by default
         
-        return self.login_manager.has_permission(menu_name, 'delete')
+        # A mapped menu missing from the permissions payload is denied
+        return self.login_manager.permission_matrix.allows_name(menu_name, action)
     
+    @traced_check
+    def get_menu_actions(self):
+        """Get allowed actions for every menu at once, e.g. to rebuild the sidebar"""
+        if not self.login_manager.is_logged_in():
+            return {menu_key: frozenset() for menu_key in self.menu_permissions}
+        
+        name_masks = self.login_manager.permission_matrix.name_masks
+        return {menu_key: actions_from_mask(name_masks.get(menu_name, 0))
+                for menu_key, menu_name in self.menu_permissions.items()}
+    
+    @traced_check
     def filter_desa_options(self, desa_list):
         """Filter desa options based on user permissions"""
         if not self.login_manager.is_logged_in():
             return []
         
-        accessible_desa = self.login_manager.get_accessible_desa()
-        if not accessible_desa:  # If empty, user can access all
-            return desa_list
-        
-        return [desa for desa in desa_list if desa in accessible_desa]
+        # An empty assignment means the user can access all
+        return self.login_manager.area_index.filter_desa(desa_list)
     
+    @traced_check
     def filter_kelompok_options(self, kelompok_list):
         """Filter kelompok options based on user permissions"""
         if not self.login_manager.is_logged_in():
             return []
         
-        accessible_kelompok = self.login_manager.get_accessible_kelompok()
-        if not accessible_kelompok:  # If empty, user can access all
-            return kelompok_list
-        
-        return [kelompok for kelompok in kelompok_list if kelompok in accessible_kelompok]
+        # An empty assignment means the user can access all
+        return self.login_manager.area_index.filter_kelompok(kelompok_list)
     
+    @traced_check
     def get_data_filter_clause(self):
         """Get SQL WHERE clause for filtering data based on user permissions"""
         if not self.login_manager.is_logged_in():
@@ -110,21 +164,129 @@ class PermissionManager:
         else:
             return "1=0"  # No access if no areas assigned
     
+    @traced_check
+    def get_data_filter_params(self, paramstyle='qmark', large_list_threshold=None, large_list_form='any'):
+        """Get a parameterized WHERE clause and its bound parameters.
+        
+        `paramstyle` is 'qmark' (?) or 'format' (%s). Area lists longer than
+        `large_list_threshold` use `= ANY(?)` with a single array parameter
+        (large_list_form='any', PostgreSQL) or a join against the temp tables
+        filled by create_area_temp_tables() (large_list_form='temp_table').
+        The result is cached until the user or their permissions change.
+        """
+        if not self.login_manager.is_logged_in():
+            return "1=0", ()
+        
+        return self._cached('filter_params', (paramstyle, large_list_threshold, large_list_form),
+                            self._build_filter_params, paramstyle, large_list_threshold, large_list_form)
+    
+    def _build_filter_params(self, paramstyle, large_list_threshold, large_list_form):
+        user = self.login_manager.get_current_user()
+        if user and user.get('role') == 'super_admin':
+            return "1=1", ()  # Full access
+        
+        placeholder = self._placeholder(paramstyle)
+        conditions = []
+        params = []
+        
+        for column, values in (('desa', self.login_manager.get_accessible_desa()),
+                               ('kelompok', self.login_manager.get_accessible_kelompok())):
+            if not values:
+                continue
+            
+            if large_list_threshold is not None and len(values) > large_list_threshold:
+                if large_list_form == 'temp_table':
+                    conditions.append(f"{column} IN (SELECT name FROM {self._temp_table_name(column)})")
+                    continue
+                if large_list_form == 'any':
+                    conditions.append(f"{column} = ANY({placeholder})")
+                    params.append(list(values))
+                    continue
+                raise ValueError(f"Unknown large_list_form: {large_list_form}")
+            
+            conditions.append("{} IN ({})".format(column, ','.join([placeholder] * len(values))))
+            params.extend(values)
+        
+        if conditions:
+            return " OR ".join(conditions), tuple(params)
+        else:
+            return "1=0", ()  # No access if no areas assigned
+    
+    def create_area_temp_tables(self, cursor, paramstyle='qmark'):
+        """Load accessible areas into TEMP tables for large_list_form='temp_table'"""
+        placeholder = self._placeholder(paramstyle)
+        for column, values in (('desa', self.login_manager.get_accessible_desa()),
+                               ('kelompok', self.login_manager.get_accessible_kelompok())):
+            table = self._temp_table_name(column)
+            cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {table} (name TEXT PRIMARY KEY)")
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.executemany(f"INSERT INTO {table} (name) VALUES ({placeholder})",
+                               [(value,) for value in values])
+    
+    @staticmethod
+    def _placeholder(paramstyle):
+        placeholders = {'qmark': '?', 'format': '%s'}
+        if paramstyle not in placeholders:
+            raise ValueError(f"Unsupported paramstyle: {paramstyle}")
+        return placeholders[paramstyle]
+    
+    @staticmethod
+    def _temp_table_name(column):
+        return f"accessible_{column}"
+    
+    def scan_session(self, ttl=300, max_rejected=10000, denied_ttl=5):
+        """ScanSession answering QR attendance checks from an in-memory snapshot"""
+        from auth.scan_session import ScanSession
+        
+        return ScanSession(self, ttl=ttl, max_rejected=max_rejected, denied_ttl=denied_ttl)
+    
+    @traced_check
     def can_access_participant_data(self, desa, kelompok):
         """Check if user can access specific participant data"""
         if not self.login_manager.is_logged_in():
             return False
         
-        # Check desa access
-        if desa and not self.login_manager.can_access_desa(desa):
+        return self._cached('participant', (desa, kelompok), self._participant_access, desa, kelompok)
+    
+    def _participant_access(self, desa, kelompok):
+        # Check desa access; an empty (None, '', NaN, NA) area is not checked
+        if not is_missing(desa) and not self.login_manager.can_access_desa(desa):
             return False
         
         # Check kelompok access
-        if kelompok and not self.login_manager.can_access_kelompok(kelompok):
+        if not is_missing(kelompok) and not self.login_manager.can_access_kelompok(kelompok):
             return False
         
         return True
     
+    @traced_check
+    def authorize_rows(self, data, kelompok=None, desa_column='desa', kelompok_column='kelompok'):
+        """Check participant access for many rows at once.
+        
+        `data` is either a pandas DataFrame or the desa column (list or NumPy
+        array) with `kelompok` as the matching column. Returns a boolean mask
+        of the same kind, equivalent to can_access_participant_data per row.
+        """
+        if hasattr(data, 'columns'):
+            desa = data[desa_column]
+            kelompok = data[kelompok_column] if kelompok_column in data.columns else None
+        else:
+            desa = data
+        
+        if not self.login_manager.is_logged_in() or not self.login_manager.get_current_user():
+            return denied_mask(desa)
+        
+        return self.login_manager.area_index.row_mask(desa, kelompok)
+    
+    def iter_authorized_rows(self, rows, desa_key='desa', kelompok_key='kelompok', chunk_size=5000):
+        """Lazily filter an iterable of rows (dicts or sequences) in chunks"""
+        if not self.login_manager.is_logged_in() or not self.login_manager.get_current_user():
+            return
+        
+        yield from self.login_manager.area_index.iter_allowed_rows(
+            rows, desa_key, kelompok_key, chunk_size
+        )
+    
     def get_user_info_display(self):
         """Get formatted user info for display"""
         if not self.login_manager.is_logged_in():
@@ -0,0 +1,90 @@
+# Action bits stored in each menu's permission mask
+VIEW = 1
+CREATE = 2
+EDIT = 4
+DELETE = 8
+
+ACTION_BITS = {
+    'view': VIEW,
+    'create': CREATE,
+    'edit': EDIT,
+    'delete': DELETE
+}
+
+ALL_ACTIONS = VIEW | CREATE | EDIT | DELETE
+
+# Menu keys used by the desktop app mapped to role_permissions.menu_name
+MENU_PERMISSIONS = {
+    'dashboard': 'Dashboard',
+    'input_data': 'Input Data Muda-Mudi',
+    'manajemen_kegiatan': 'Manajemen Kegiatan',
+    'scan_qr': 'Scan QR Absensi',
+    'pencarian_data': 'Pencarian Data',
+    'laporan': 'Laporan',
+    'gabung_database': 'Gabung Database'
+}
+
+
+def mask_from_flags(menu_perms):
+    """Convert a {'can_view': ..., 'can_create': ...} dict into a bitmask"""
+    mask = 0
+    for action, bit in ACTION_BITS.items():
+        if menu_perms.get(f'can_{action}'):
+            mask |= bit
+    return mask
+
+
+def actions_from_mask(mask):
+    return frozenset(action for action, bit in ACTION_BITS.items() if mask & bit)
+
+
+class PermissionMatrix:
+    """Permissions payload compiled into integer bitmasks per menu"""
+    
+    def __init__(self, menu_masks, name_masks):
+        self.menu_masks = menu_masks
+        self.name_masks = name_masks
+    
+    @classmethod
+    def compile(cls, permissions, menu_permissions=MENU_PERMISSIONS):
+        """Build the matrix from the /api/user/permissions `permissions` dict"""
+        permissions = permissions or {}
+        name_masks = {
+            menu_name: mask_from_flags(menu_perms or {})
+            for menu_name, menu_perms in permissions.items()
+        }
+        menu_masks = {
+            menu_key: name_masks.get(menu_name, 0)
+            for menu_key, menu_name in menu_permissions.items()
+        }
+        return cls(menu_masks, name_masks)
+    
+    @classmethod
+    def for_role(cls, role, menu_permissions=MENU_PERMISSIONS):
+        """Build the matrix from a role's schema.sql defaults (auth.role_defaults)"""
+        from auth.role_defaults import ROLE_NAME_MASKS
+        
+        name_masks = dict(ROLE_NAME_MASKS.get(role, ()))
+        menu_masks = {
+            menu_key: name_masks.get(menu_name, 0)
+            for menu_key, menu_name in menu_permissions.items()
+        }
+        return cls(menu_masks, name_masks)
+    
+    def mask_for(self, menu_key):
+        """Bitmask for a menu key, or None when the menu is not permission-controlled"""
+        return self.menu_masks.get(menu_key)
+    
+    def allows(self, menu_key, action='view'):
+        mask = self.menu_masks.get(menu_key)
+        if mask is None:
+            return True  # Unmapped menus are allowed by default
+        
+        return bool(mask & ACTION_BITS.get(action, 0))
+    
+    def allows_name(self, menu_name, action='view'):
+        return bool(self.name_masks.get(menu_name, 0) & ACTION_BITS.get(action, 0))
+    
+    def allowed_actions(self):
+        """Allowed action set for every menu key in one call"""
+        return {menu_key: actions_from_mask(mask) for menu_key, mask in self.menu_masks.items()}
\ No newline at end of file
@@ -0,0 +1,112 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+
+# LoginManager.last_refresh_failure values
+REFRESH_REJECTED = 'rejected'
+REFRESH_UNREACHABLE = 'unreachable'
+
+
+class RefreshScheduler:
+    """Background thread that refreshes access tokens before they expire.
+    
+    One scheduler can serve many LoginManager instances. Each manager is
+    refreshed `lead_time` seconds (minus up to `jitter` seconds) before its
+    token's `exp` claim; failed refreshes are retried after `retry_delay`,
+    unless the server rejected the refresh token.
+    """
+    
+    def __init__(self, lead_time=120, jitter=60, retry_delay=30):
+        self.lead_time = lead_time
+        self.jitter = jitter
+        self.retry_delay = retry_delay
+        
+        self._heap = []
+        self._entries = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+    
+    def start(self):
+        with self._condition:
+            self._stopped = False
+            if self._thread and self._thread.is_alive():
+                return
+            
+            self._thread = threading.Thread(target=self._run, name='token-refresh', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+    
+    def schedule(self, manager, delay=None):
+        """(Re)schedule a manager's next refresh from its current token"""
+        if delay is None:
+            remaining = manager.token_seconds_remaining()
+            if remaining is None:
+                self.unschedule(manager)
+                return
+            
+            delay = max(0, remaining - self.lead_time - random.uniform(0, self.jitter))
+        
+        with self._condition:
+            seq = next(self._counter)
+            self._entries[id(manager)] = seq
+            heapq.heappush(self._heap, (time.monotonic() + delay, seq, manager))
+            self._condition.notify_all()
+    
+    def unschedule(self, manager):
+        with self._condition:
+            self._entries.pop(id(manager), None)
+    
+    def next_refresh_in(self, manager):
+        """Seconds until the manager's scheduled refresh, or None"""
+        with self._condition:
+            seq = self._entries.get(id(manager))
+            for due, entry_seq, _ in self._heap:
+                if entry_seq == seq:
+                    return max(0, due - time.monotonic())
+        return None
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                manager = self._next_due()
+                if manager is None:
+                    return
+            
+            if manager.access_token and manager._run_scheduled_refresh():
+                self.schedule(manager)
+            elif manager.refresh_token and manager.last_refresh_failure != REFRESH_REJECTED:
+                self.schedule(manager, delay=self.retry_delay)
+            else:
+                # Rejected refresh token: the session needs a new login
+                self.unschedule(manager)
+    
+    def _next_due(self):
+        # Called with the condition held; returns None once stopped
+        while not self._stopped:
+            if not self._heap:
+                self._condition.wait()
+                continue
+            
+            due, seq, manager = self._heap[0]
+            if self._entries.get(id(manager)) != seq:
+                heapq.heappop(self._heap)  # Superseded entry
+                continue
+            
+            wait = due - time.monotonic()
+            if wait > 0:
+                self._condition.wait(wait)
+                continue
+            
+            heapq.heappop(self._heap)
+            del self._entries[id(manager)]
+            return manager
+        
+        return None
\ No newline at end of file
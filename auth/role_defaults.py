@@ -0,0 +1,62 @@
+"""Role permission defaults compiled from database/schema.sql.
+
+Generated by tools/compile_role_defaults.py; do not edit by hand.
+"""
+
+# sha256 of the schema file the tables were compiled from
+SCHEMA_SHA256 = '288f1d25bafdb3bc4c9c323bbb192d0f840caceed4f58922d29e64aebd781724'
+
+# role -> ((menu_name, mask), ...); VIEW=1, CREATE=2, EDIT=4, DELETE=8
+ROLE_NAME_MASKS = {
+    'admin': (
+        ('Dashboard', 1),
+        ('Input Data Muda-Mudi', 15),
+        ('Manajemen Kegiatan', 15),
+        ('Scan QR Absensi', 3),
+        ('Pencarian Data', 1),
+        ('Laporan', 1),
+    ),
+    'admin_desa': (
+        ('Dashboard', 1),
+        ('Input Data Muda-Mudi', 7),
+        ('Manajemen Kegiatan', 1),
+        ('Scan QR Absensi', 3),
+        ('Pencarian Data', 1),
+        ('Laporan', 1),
+    ),
+    'admin_kelompok': (
+        ('Dashboard', 1),
+        ('Input Data Muda-Mudi', 7),
+        ('Scan QR Absensi', 3),
+        ('Pencarian Data', 1),
+    ),
+    'super_admin': (
+        ('Dashboard', 15),
+        ('Input Data Muda-Mudi', 15),
+        ('Manajemen Kegiatan', 15),
+        ('Scan QR Absensi', 15),
+        ('Pencarian Data', 15),
+        ('Laporan', 15),
+        ('Gabung Database', 15),
+    ),
+}
+
+# Complete area catalog, used for super_admin accounts
+ALL_DESA = (
+    'BANDARA', 'CENGKARENG', 'CIPONDOH', 'JELAMBAR', 'KALIDERES', 'KEBON JAHE',
+    'TAMAN KOTA', 'KAPUK MELATI',
+)
+
+ALL_KELOMPOK = (
+    'TEGAL ALUR A', 'TEGAL ALUR B', 'PREPEDAN A', 'PREPEDAN B', 'KEBON KELAPA', 'PRIMA',
+    'RAWA LELE', 'KAMPUNG DURI', 'FAJAR A', 'FAJAR B', 'FAJAR C', 'DAMAI', 'JAYA',
+    'INDAH', 'PEJAGALAN', 'BGN', 'MELATI A', 'MELATI B', 'GRIYA PERMATA', 'SEMANAN A',
+    'SEMANAN B', 'PONDOK BAHAR', 'KEBON JAHE A', 'KEBON JAHE B', 'GARIKAS', 'TANIWAN',
+    'TAMAN KOTA A', 'TAMAN KOTA B', 'RAWA BUAYA A', 'RAWA BUAYA B',
+)
+
+# desa -> kelompok known from the seed rows
+DESA_KELOMPOK = {
+    'BANDARA': ('PRIMA', 'RAWA LELE', 'KAMPUNG DURI'),
+    'CENGKARENG': ('FAJAR A', 'FAJAR B', 'FAJAR C'),
+}
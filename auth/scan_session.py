@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import deque
+
+from auth.area_index import is_missing
+
+# Reasons a scan is rejected
+NO_PERMISSION = 'no_permission'
+AREA_DENIED = 'area_denied'
+SESSION_INVALID = 'session_invalid'
+
+REJECTION_MESSAGES = {
+    NO_PERMISSION: "Tidak memiliki izin Scan QR Absensi",
+    AREA_DENIED: "Peserta di luar area akses Anda",
+    SESSION_INVALID: "Sesi login tidak valid, silakan login kembali"
+}
+
+
+class RejectedScan:
+    """A scan that failed authorization, kept for later review"""
+    
+    def __init__(self, payload, desa, kelompok, reason, scanned_at):
+        self.payload = payload
+        self.desa = desa
+        self.kelompok = kelompok
+        self.reason = reason
+        self.scanned_at = scanned_at
+    
+    @property
+    def message(self):
+        return REJECTION_MESSAGES.get(self.reason, self.reason)
+    
+    def to_dict(self):
+        return {'payload': self.payload, 'desa': self.desa, 'kelompok': self.kelompok,
+                'reason': self.reason, 'message': self.message, 'scanned_at': self.scanned_at}
+    
+    def __repr__(self):
+        return f"RejectedScan({self.payload!r}, {self.desa!r}, {self.kelompok!r}, {self.reason})"
+
+
+class ScanSession:
+    """Authorization snapshot for the "Scan QR Absensi" flow.
+    
+    The session is validated once (one is_logged_in() and the `create`
+    permission of `menu_key`) and its area index captured. Per-scan checks
+    then only read that snapshot, without I/O. The snapshot lives for at
+    most `ttl` seconds and never beyond the access token's expiry; it is
+    also taken again when the login manager's permissions change. A denied
+    snapshot (no session or no scan permission) only lives `denied_ttl`
+    seconds, so scans resume soon after e.g. a brief outage. Rejected scans
+    are queued (up to `max_rejected`, oldest dropped first).
+    """
+    
+    def __init__(self, permission_manager, menu_key='scan_qr', ttl=300, max_rejected=10000, denied_ttl=5):
+        self.permission_manager = permission_manager
+        self.login_manager = permission_manager.login_manager
+        self.menu_key = menu_key
+        self.ttl = ttl
+        self.denied_ttl = denied_ttl
+        self.rejected = deque(maxlen=max_rejected)
+        self.accepted_count = 0
+        self.rejected_count = 0
+        self.renewals = 0
+        
+        self._lock = threading.Lock()
+        self._expires_at = 0.0
+        self._generation = None
+        self._can_scan = False
+        self._denied_reason = SESSION_INVALID
+        self._area_index = None
+        
+        self.renew()
+    
+    def renew(self):
+        """Validate the login and capture a new snapshot; returns whether scans are allowed"""
+        with self._lock:
+            return self._renew()
+    
+    def _renew(self):
+        login_manager = self.login_manager
+        # Read before the state it guards (LoginManager bumps it last), so a
+        # permission change landing meanwhile forces another renewal
+        generation = login_manager.session_generation
+        logged_in = login_manager.is_logged_in() and login_manager.current_user is not None
+        can_scan = logged_in and self.permission_manager.can_create_data(self.menu_key)
+        
+        lifetime = self.ttl if can_scan else min(self.ttl, self.denied_ttl)
+        if can_scan:
+            remaining = login_manager.token_seconds_remaining()
+            if remaining is not None:
+                lifetime = max(0.0, min(lifetime, remaining))
+        
+        self._can_scan = can_scan
+        self._denied_reason = None if can_scan else (NO_PERMISSION if logged_in else SESSION_INVALID)
+        self._area_index = login_manager.area_index
+        self._generation = generation
+        self._expires_at = time.monotonic() + lifetime
+        self.renewals += 1
+        login_manager.metrics.increment('scan_session_renewals')
+        return self._can_scan
+    
+    def is_current(self):
+        """True while the snapshot may answer scans without renewing"""
+        return (time.monotonic() < self._expires_at
+                and self._generation == self.login_manager.session_generation)
+    
+    def check(self, desa, kelompok):
+        """Authorize one scan; returns None when allowed or the rejection reason"""
+        if not self.is_current():
+            with self._lock:
+                if not self.is_current():
+                    self._renew()
+        
+        if not self._can_scan:
+            return self._denied_reason
+        
+        # Same rules as PermissionManager.can_access_participant_data
+        area_index = self._area_index
+        if not area_index.can_access_desa(desa) and not is_missing(desa):
+            return AREA_DENIED
+        if not area_index.can_access_kelompok(kelompok) and not is_missing(kelompok):
+            return AREA_DENIED
+        return None
+    
+    def authorize(self, desa, kelompok, payload=None):
+        """Check a scanned participant; a rejected scan is queued with `payload`"""
+        reason = self.check(desa, kelompok)
+        if reason is None:
+            self.accepted_count += 1
+            return True
+        
+        self.rejected_count += 1
+        self.rejected.append(RejectedScan(payload, desa, kelompok, reason, time.time()))
+        return False
+    
+    def drain_rejected(self):
+        """Take all queued rejected scans, oldest first"""
+        drained = []
+        while True:
+            try:
+                drained.append(self.rejected.popleft())
+            except IndexError:
+                return drained
+    
+    def stats(self):
+        return {
+            'accepted': self.accepted_count,
+            'rejected': self.rejected_count,
+            'queued_rejections': len(self.rejected),
+            'renewals': self.renewals,
+            'expires_in': max(0.0, self._expires_at - time.monotonic()),
+            'can_scan': self._can_scan
+        }
\ No newline at end of file
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from auth.login_manager import LoginManager
+from auth.permission_manager import PermissionManager
+from auth.refresh_scheduler import RefreshScheduler
+from auth.transport import AuthTransport
+
+
+class SessionPool:
+    """Many authenticated identities in one process, for batch jobs.
+    
+    All sessions share one AuthTransport (one connection pool) and one
+    RefreshScheduler. At most `max_sessions` stay in memory; the least
+    recently used one is evicted beyond that. With `token_dir` every
+    identity keeps its own token file there, so an evicted session is
+    restored on the next get(); without it sessions live in memory only.
+    """
+    
+    def __init__(self, api_base_url="https://adminweb-apps.vercel.app", max_sessions=32,
+                 token_dir=None, transport=None, refresh_scheduler=None, auto_refresh=True,
+                 pool_maxsize=10, **manager_options):
+        self.api_base_url = api_base_url
+        self.max_sessions = max_sessions
+        self.token_dir = token_dir
+        self.transport = transport or AuthTransport(api_base_url, pool_maxsize=pool_maxsize)
+        self.refresh_scheduler = refresh_scheduler or RefreshScheduler()
+        self.auto_refresh = auto_refresh
+        self.manager_options = manager_options
+        self.evictions = 0
+        
+        self._sessions = OrderedDict()
+        self._lock = threading.RLock()
+        
+        if token_dir:
+            os.makedirs(token_dir, exist_ok=True)
+    
+    def __len__(self):
+        return len(self._sessions)
+    
+    def __contains__(self, identity):
+        return identity in self._sessions
+    
+    def identities(self):
+        """Identities in memory, least recently used first"""
+        with self._lock:
+            return list(self._sessions)
+    
+    def token_file_for(self, identity):
+        if not self.token_dir:
+            return None
+        digest = hashlib.sha256(identity.encode()).hexdigest()[:16]
+        return os.path.join(self.token_dir, f"auth_tokens_{digest}.dat")
+    
+    def _create_session(self, identity):
+        login_manager = LoginManager(
+            api_base_url=self.api_base_url,
+            transport=self.transport,
+            token_file=self.token_file_for(identity),
+            key_file=os.path.join(self.token_dir, "auth.key") if self.token_dir else None,
+            **self.manager_options
+        )
+        return login_manager, PermissionManager(login_manager)
+    
+    def _store(self, identity, session):
+        with self._lock:
+            self._sessions[identity] = session
+            self._sessions.move_to_end(identity)
+            while len(self._sessions) > self.max_sessions:
+                _, (login_manager, _) = self._sessions.popitem(last=False)
+                login_manager.stop_auto_refresh()
+                self.evictions += 1
+    
+    def login(self, username, password, identity=None):
+        """Log in an identity (the username by default); returns (success, message)"""
+        identity = identity or username
+        with self._lock:
+            session = self._sessions.get(identity)
+        if session is None:
+            session = self._create_session(identity)
+        
+        login_manager = session[0]
+        success, message = login_manager.login(username, password)
+        if success:
+            if self.auto_refresh:
+                login_manager.start_auto_refresh(scheduler=self.refresh_scheduler)
+            self._store(identity, session)
+        return success, message
+    
+    def get(self, identity):
+        """LoginManager of a logged-in identity, or None"""
+        session = self.get_session(identity)
+        return session[0] if session else None
+    
+    def get_permission_manager(self, identity):
+        session = self.get_session(identity)
+        return session[1] if session else None
+    
+    def get_session(self, identity):
+        """(LoginManager, PermissionManager) of a logged-in identity, or None"""
+        with self._lock:
+            session = self._sessions.get(identity)
+            if session is not None:
+                self._sessions.move_to_end(identity)
+                return session
+        
+        # Restore an evicted session from its token file
+        token_file = self.token_file_for(identity)
+        if not token_file or not os.path.exists(token_file):
+            return None
+        
+        session = self._create_session(identity)
+        if not session[0].access_token:
+            return None
+        
+        if self.auto_refresh:
+            session[0].start_auto_refresh(scheduler=self.refresh_scheduler)
+        self._store(identity, session)
+        return session
+    
+    def evict(self, identity):
+        """Drop an identity from memory; its token file is kept"""
+        with self._lock:
+            session = self._sessions.pop(identity, None)
+        if session:
+            session[0].stop_auto_refresh()
+        return session is not None
+    
+    def logout(self, identity):
+        session = self.get_session(identity)
+        if session is None:
+            return False
+        
+        self.evict(identity)
+        return session[0].logout()
+    
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for login_manager, _ in sessions:
+            login_manager.stop_auto_refresh()
+        self.refresh_scheduler.stop()
+        self.transport.close()
\ No newline at end of file
@@ -0,0 +1,56 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_startup_pipeline(login_manager):
+    """Check a cached session with one round of concurrent requests.
+    
+    The connectivity probe, token verification and a speculative permission
+    fetch for the cached token start together. The fetched permissions are
+    only applied if that token verified; otherwise they are discarded and the
+    session falls back to the usual refresh (or offline) path.
+    """
+    started = time.perf_counter()
+    result = {
+        'online': False,
+        'logged_in': False,
+        'permissions_changed': False,
+        'speculation_used': False,
+        'elapsed': 0.0
+    }
+    
+    token = login_manager.access_token
+    if not token:
+        result['online'] = login_manager.transport.probe()
+        result['elapsed'] = time.perf_counter() - started
+        return result
+    
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix='auth-startup') as pool:
+        probe = pool.submit(login_manager.transport.probe)
+        verify = pool.submit(login_manager.verify_token)
+        fetch = pool.submit(login_manager._fetch_permissions, token)
+        
+        result['online'] = probe.result()
+        token_valid = verify.result()
+        fetched = fetch.result()
+    
+    if token_valid and login_manager.access_token == token:
+        result['logged_in'] = True
+        result['speculation_used'] = fetched is not None
+        changed = login_manager._apply_fetched_permissions(fetched)
+    else:
+        # Speculative permissions belong to a rejected token: discard them
+        changed = False
+        if login_manager.refresh_access_token():
+            result['logged_in'] = True
+            changed = login_manager._flight.do('permissions', login_manager._load_permissions)
+        else:
+            # Offline fallback, or clear the session if it was rejected
+            result['logged_in'] = login_manager.is_logged_in()
+    
+    if changed:
+        login_manager._save_tokens()
+    
+    result['permissions_changed'] = changed
+    result['elapsed'] = time.perf_counter() - started
+    return result
\ No newline at end of file
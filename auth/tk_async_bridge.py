@@ -0,0 +1,61 @@
+import asyncio
+import queue
+import threading
+
+
+class TkAsyncBridge:
+    """Runs one asyncio loop next to the Tk mainloop.
+    
+    Coroutines are submitted from the Tk thread; their results are queued
+    and delivered back on the Tk thread by a root.after() poller, so
+    callbacks may touch widgets directly.
+    """
+    
+    def __init__(self, root, poll_interval_ms=20):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self.loop = asyncio.new_event_loop()
+        self._results = queue.SimpleQueue()
+        self._closed = False
+        
+        self._thread = threading.Thread(target=self._run_loop, name='tk-asyncio', daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_interval_ms, self._drain)
+    
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    def submit(self, coro, on_done=None, on_error=None):
+        """Schedule a coroutine; callbacks run on the Tk thread"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        if on_done or on_error:
+            future.add_done_callback(lambda f: self._results.put((f, on_done, on_error)))
+        return future
+    
+    def _drain(self):
+        while True:
+            try:
+                future, on_done, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            
+            try:
+                error = future.exception()
+                if error is None:
+                    if on_done:
+                        on_done(future.result())
+                elif on_error:
+                    on_error(error)
+                else:
+                    print(f"Error in background task: {error}")
+            except Exception as e:
+                print(f"Error in async callback: {e}")
+        
+        if not self._closed:
+            self.root.after(self.poll_interval_ms, self._drain)
+    
+    def close(self):
+        self._closed = True
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=2)
\ No newline at end of file
@@ -0,0 +1,194 @@
+import json
+import os
+import tempfile
+import threading
+
+from auth.file_lock import FileLock
+
+# Token data fields that make up the (large) permission snapshot
+SNAPSHOT_KEYS = ('permissions', 'accessible_areas', 'permissions_etag', 'permissions_hash')
+
+
+def atomic_write(path, data):
+    """Write bytes to a temporary file and rename it over `path`.
+    
+    Readers see either the old or the new content, never a partial file,
+    even if the process dies mid-write.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class TokenStore:
+    """Where LoginManager keeps its session between runs.
+    
+    load() returns the saved token data dict or None, save() replaces it
+    and clear() removes it. `lock` is a re-entrant context manager held
+    around read-modify-write sequences such as a token refresh; it defaults
+    to a process-local RLock, so subclasses call super().__init__().
+    """
+    
+    def __init__(self):
+        self.lock = threading.RLock()
+    
+    def load(self):
+        raise NotImplementedError
+    
+    def save(self, token_data):
+        raise NotImplementedError
+    
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryTokenStore(TokenStore):
+    """Keeps the session for the lifetime of the process only"""
+    
+    def __init__(self):
+        super().__init__()
+        self._data = None
+    
+    def load(self):
+        with self.lock:
+            return json.loads(self._data) if self._data is not None else None
+    
+    def save(self, token_data):
+        with self.lock:
+            self._data = json.dumps(token_data)
+    
+    def clear(self):
+        with self.lock:
+            self._data = None
+
+
+class FileTokenStore(TokenStore):
+    """Fernet-encrypted JSON file, replaced atomically on every save"""
+    
+    def __init__(self, path="auth_tokens.dat", key_file="auth.key"):
+        super().__init__()
+        self.path = path
+        self.key_file = key_file
+        # Shared with other app instances using the same file
+        self.lock = FileLock(path + ".lock")
+        self._cipher = None
+    
+    @property
+    def cipher(self):
+        if self._cipher is None:
+            from cryptography.fernet import Fernet
+            
+            if os.path.exists(self.key_file):
+                with open(self.key_file, 'rb') as f:
+                    key = f.read()
+            else:
+                key = Fernet.generate_key()
+                atomic_write(self.key_file, key)
+            
+            self._cipher = Fernet(key)
+        return self._cipher
+    
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            encrypted_data = f.read()
+        return json.loads(self.cipher.decrypt(encrypted_data).decode())
+    
+    def _write(self, path, data):
+        atomic_write(path, self.cipher.encrypt(json.dumps(data).encode()))
+    
+    def load(self):
+        with self.lock:
+            if not os.path.exists(self.path):
+                return None
+            return self._read(self.path)
+    
+    def save(self, token_data):
+        with self.lock:
+            self._write(self.path, token_data)
+    
+    def clear(self):
+        with self.lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class SplitFileTokenStore(FileTokenStore):
+    """Tokens and the permission snapshot in separate encrypted files.
+    
+    The snapshot file is rewritten only when `permissions_hash` changes,
+    so a token refresh rewrites just the small token file. The skip is
+    checked against the file on disk: another app instance may have
+    replaced the snapshot since this one last wrote or read it. A token
+    file written by FileTokenStore still loads.
+    """
+    
+    def __init__(self, path="auth_tokens.dat", key_file="auth.key", snapshot_path=None):
+        super().__init__(path, key_file)
+        self.snapshot_path = snapshot_path or path + ".permissions"
+        # Hash of the snapshot this instance wrote or read, and the file's
+        # stat signature at that time
+        self._snapshot_hash = None
+        self._snapshot_signature = None
+    
+    def _stat_snapshot(self):
+        """(inode, size, mtime) of the snapshot file; every write replaces the inode"""
+        try:
+            stat = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    
+    def load(self):
+        with self.lock:
+            if not os.path.exists(self.path):
+                return None
+            
+            token_data = self._read(self.path)
+            if 'permissions' in token_data:
+                return token_data  # Single-file layout
+            
+            expected_hash = token_data.pop('permissions_hash', None)
+            signature = self._stat_snapshot()
+            if expected_hash and signature:
+                snapshot = self._read(self.snapshot_path)
+                if snapshot.get('permissions_hash') == expected_hash:
+                    token_data.update(snapshot)
+                    self._snapshot_hash = expected_hash
+                    self._snapshot_signature = signature
+            # Without a matching snapshot no permissions (and no ETag) are
+            # returned, so they are fetched again in full.
+            return token_data
+    
+    def save(self, token_data):
+        token_data = dict(token_data)
+        snapshot = {key: token_data.pop(key, None) for key in SNAPSHOT_KEYS}
+        token_data['permissions_hash'] = snapshot['permissions_hash']
+        
+        with self.lock:
+            if (snapshot['permissions_hash'] is None
+                    or snapshot['permissions_hash'] != self._snapshot_hash
+                    or self._stat_snapshot() != self._snapshot_signature):
+                self._write(self.snapshot_path, snapshot)
+                self._snapshot_hash = snapshot['permissions_hash']
+                self._snapshot_signature = self._stat_snapshot()
+            
+            self._write(self.path, token_data)
+    
+    def clear(self):
+        with self.lock:
+            for path in (self.path, self.snapshot_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._snapshot_hash = None
+            self._snapshot_signature = None
\ No newline at end of file
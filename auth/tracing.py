@@ -0,0 +1,221 @@
+import functools
+import threading
+import time
+import warnings
+
+# Span kinds
+CHECK = 'check'
+REQUEST = 'request'
+
+_local = threading.local()
+# Traces open on any thread; checked first so the untraced path skips the thread-local lookup
+_open_count = 0
+_count_lock = threading.Lock()
+
+
+class TraceBudgetExceeded(Exception):
+    def __init__(self, message, trace):
+        super().__init__(message)
+        self.trace = trace
+
+
+class TraceBudgetWarning(UserWarning):
+    pass
+
+
+class Span:
+    """One recorded permission check or auth request"""
+    
+    def __init__(self, kind, name, detail, depth, start):
+        self.kind = kind
+        self.name = name
+        self.detail = detail
+        self.depth = depth
+        self.start = start
+        self.elapsed = None
+        self.result = None
+    
+    def describe(self):
+        if self.kind == REQUEST:
+            return f"{self.kind} {self.name} {self.detail}"
+        return f"{self.kind} {self.name}({self.detail}) -> {self.result!r}"
+    
+    def to_dict(self):
+        return {'kind': self.kind, 'name': self.name, 'detail': self.detail, 'depth': self.depth,
+                'start': self.start, 'elapsed': self.elapsed, 'result': repr(self.result)}
+    
+    def __repr__(self):
+        return f"Span({self.describe()})"
+
+
+def active_traces():
+    """Traces open on the calling thread, outermost first"""
+    return getattr(_local, 'traces', None) or ()
+
+
+class Trace:
+    """Permission checks and auth requests made during one UI action.
+    
+    Only the thread that opened the trace is recorded; background refreshes
+    and revalidations on other threads are not part of the action. Spans
+    are kept in call order with their nesting depth, so a check and the
+    requests its is_logged_in() made appear as a flat tree.
+    
+    The budget (`max_requests`, `max_checks`, `max_seconds`) is checked when
+    the trace closes. `on_exceed` is 'warn' (TraceBudgetWarning), 'raise'
+    (TraceBudgetExceeded) or a callable receiving the trace.
+    
+    Use it as `with Trace('open_peserta', max_requests=1) as trace:` or as a
+    decorator, which records every call in a fresh Trace.
+    """
+    
+    def __init__(self, name, max_requests=None, max_checks=None, max_seconds=None, on_exceed='warn'):
+        self.name = name
+        self.max_requests = max_requests
+        self.max_checks = max_checks
+        self.max_seconds = max_seconds
+        self.on_exceed = on_exceed
+        self.spans = []
+        self.started = None
+        self.elapsed = None
+        self._open = []
+    
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Trace(self.name, self.max_requests, self.max_checks, self.max_seconds, self.on_exceed):
+                return fn(*args, **kwargs)
+        return wrapper
+    
+    def __enter__(self):
+        global _open_count
+        self.started = time.perf_counter()
+        _local.traces = active_traces() + (self,)
+        with _count_lock:
+            _open_count += 1
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        global _open_count
+        self.elapsed = time.perf_counter() - self.started
+        _local.traces = tuple(trace for trace in active_traces() if trace is not self)
+        with _count_lock:
+            _open_count -= 1
+        
+        # Do not mask an exception raised by the action itself
+        if exc_type is None:
+            self.check_budget()
+        return False
+    
+    @property
+    def request_count(self):
+        return sum(1 for span in self.spans if span.kind == REQUEST)
+    
+    @property
+    def check_count(self):
+        return sum(1 for span in self.spans if span.kind == CHECK)
+    
+    def _begin(self, kind, name, detail):
+        span = Span(kind, name, detail, len(self._open), time.perf_counter() - self.started)
+        self.spans.append(span)
+        self._open.append(span)
+        return span
+    
+    def _end(self, span, result):
+        span.elapsed = time.perf_counter() - self.started - span.start
+        span.result = result
+        if self._open and self._open[-1] is span:
+            self._open.pop()
+    
+    def _record_request(self, endpoint, method, outcome, elapsed, status):
+        detail = f"{method} {status if status is not None else outcome}"
+        span = Span(REQUEST, endpoint, detail, len(self._open),
+                    time.perf_counter() - self.started - elapsed)
+        span.elapsed = elapsed
+        span.result = outcome
+        self.spans.append(span)
+    
+    def exceeded(self):
+        """Budget violations as messages; empty when within budget"""
+        problems = []
+        if self.max_requests is not None and self.request_count > self.max_requests:
+            problems.append(f"{self.request_count} requests (budget {self.max_requests})")
+        if self.max_checks is not None and self.check_count > self.max_checks:
+            problems.append(f"{self.check_count} checks (budget {self.max_checks})")
+        if self.max_seconds is not None and self.elapsed is not None and self.elapsed > self.max_seconds:
+            problems.append(f"{self.elapsed * 1000:.1f} ms (budget {self.max_seconds * 1000:.1f} ms)")
+        return problems
+    
+    def check_budget(self):
+        problems = self.exceeded()
+        if not problems:
+            return
+        
+        message = f"Trace '{self.name}' over budget: {', '.join(problems)}\n{self.report()}"
+        if self.on_exceed == 'raise':
+            raise TraceBudgetExceeded(message, self)
+        if callable(self.on_exceed):
+            self.on_exceed(self)
+        else:
+            warnings.warn(message, TraceBudgetWarning, stacklevel=3)
+    
+    def report(self):
+        elapsed = self.elapsed if self.elapsed is not None else time.perf_counter() - self.started
+        lines = [f"trace {self.name!r}: {self.check_count} checks, {self.request_count} requests, "
+                 f"{elapsed * 1000:.1f} ms"]
+        for span in self.spans:
+            span_elapsed = f"{span.elapsed * 1000:8.2f}ms" if span.elapsed is not None else "    open  "
+            lines.append(f"  {span.start * 1000:+9.2f}ms {span_elapsed}  "
+                         f"{'  ' * span.depth}{span.describe()}")
+        return "\n".join(lines)
+    
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'elapsed': self.elapsed,
+            'checks': self.check_count,
+            'requests': self.request_count,
+            'exceeded': self.exceeded(),
+            'spans': [span.to_dict() for span in self.spans]
+        }
+
+
+def _describe_arg(value):
+    # Row data and option lists are summarized, not printed
+    if isinstance(value, (str, int, float, bool, type(None))) or not hasattr(value, '__len__'):
+        return repr(value)
+    return f"<{type(value).__name__} of {len(value)}>"
+
+
+def traced_check(method):
+    """Record a PermissionManager check as a span while a trace is active"""
+    name = method.__name__
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not _open_count:
+            return method(self, *args, **kwargs)
+        
+        traces = getattr(_local, 'traces', None)
+        if not traces:
+            return method(self, *args, **kwargs)
+        
+        detail = ', '.join([_describe_arg(arg) for arg in args] +
+                           [f"{key}={_describe_arg(value)}" for key, value in kwargs.items()])
+        spans = [(trace, trace._begin(CHECK, name, detail)) for trace in traces]
+        result = None
+        try:
+            result = method(self, *args, **kwargs)
+            return result
+        finally:
+            for trace, span in spans:
+                trace._end(span, result)
+    return wrapper
+
+
+def record_request(endpoint, method, outcome, elapsed, status=None):
+    """Called by AuthMetrics for every request; a no-op without a trace"""
+    if not _open_count:
+        return
+    for trace in active_traces():
+        trace._record_request(endpoint, method, outcome, elapsed, status)
\ No newline at end of file
@@ -0,0 +1,207 @@
+import threading
+import time
+
+from auth import metrics as auth_metrics
+from auth.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+# API paths used by the desktop client, keyed by endpoint name
+ENDPOINTS = {
+    'login': '/api/auth/login',
+    'refresh': '/api/auth/refresh',
+    'verify': '/api/auth/verify',
+    'permissions': '/api/user/permissions',
+    'probe': '/api/auth/verify',
+    'list_users': '/api/user/list',
+    'create_user': '/api/user/create',
+    'update_user': '/api/user/update/{id}'
+}
+
+# (connect, read) timeouts in seconds per endpoint
+DEFAULT_TIMEOUTS = {
+    'login': (5, 15),
+    'refresh': (5, 10),
+    'verify': (3, 5),
+    'permissions': (5, 10),
+    'probe': (3, 5),
+    'list_users': (5, 20),
+    'create_user': (5, 30),
+    'update_user': (5, 15)
+}
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+# Gateway errors count as the server being unreachable
+UNAVAILABLE_STATUSES = frozenset([502, 503, 504])
+
+# Set while a request with a time budget is sent on this thread; the
+# adapter then makes a single attempt
+_budget = threading.local()
+
+
+def _retry_adapter(**kwargs):
+    """HTTPAdapter whose retries are skipped for requests with a time budget"""
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    class RetryAdapter(HTTPAdapter):
+        @property
+        def max_retries(self):
+            if getattr(_budget, 'active', False):
+                return Retry(0, read=False)
+            return self._max_retries
+        
+        @max_retries.setter
+        def max_retries(self, value):
+            self._max_retries = value
+    
+    return RetryAdapter(**kwargs)
+
+
+def budget_timeout(timeout, max_time):
+    """Fit a (connect, read) timeout into `max_time` seconds in total"""
+    if not isinstance(timeout, tuple):
+        return min(timeout, max_time)
+    
+    connect, read = timeout
+    connect = min(connect, max_time * connect / (connect + read))
+    return (connect, min(read, max_time - connect))
+
+
+class AuthTransport:
+    """Pooled keep-alive HTTP session shared by the auth client.
+    
+    `requests` is imported and the session created on first use, so
+    importing the auth package stays cheap.
+    """
+    
+    def __init__(self, api_base_url, pool_connections=2, pool_maxsize=10,
+                 timeouts=None, max_retries=2, backoff_factor=0.3, circuit_breaker=None,
+                 metrics=None):
+        self.api_base_url = api_base_url.rstrip('/')
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(probe=self.probe)
+        self.metrics = metrics or auth_metrics.AuthMetrics()
+    
+    @property
+    def session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+    
+    def _create_session(self):
+        import requests
+        from urllib3.util.retry import Retry
+        
+        # Connect and read failures are not retried here: each attempt would
+        # wait for its full timeout while the circuit breaker counts only one
+        # failure, so an unreachable server would block the UI several times
+        # over. Gateway errors of idempotent calls are retried, except for
+        # requests sent with a time budget (see request()).
+        retry = Retry(
+            total=self.max_retries,
+            connect=0,
+            read=0,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False
+        )
+        adapter = _retry_adapter(pool_connections=self.pool_connections,
+                                 pool_maxsize=self.pool_maxsize,
+                                 max_retries=retry)
+        
+        session = requests.Session()
+        session.headers.update({'Connection': 'keep-alive'})
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def url_for(self, endpoint, **path_params):
+        path = ENDPOINTS.get(endpoint, endpoint)
+        if path_params:
+            path = path.format(**path_params)
+        return f"{self.api_base_url}{path}"
+    
+    def request(self, method, endpoint, path_params=None, max_time=None, **kwargs):
+        """Send a request.
+        
+        With `max_time` the request gets one attempt, without status
+        retries, and its connect and read timeouts are shrunk to add up to
+        at most `max_time` seconds.
+        """
+        if not self.circuit_breaker.allow_request():
+            self.metrics.observe_request(endpoint, method, auth_metrics.REJECTED, 0.0)
+            raise CircuitOpenError(f"Server unreachable, skipping {endpoint}")
+        
+        import requests
+        
+        kwargs.setdefault('timeout', self.timeouts.get(endpoint, (5, 10)))
+        if max_time is not None:
+            kwargs['timeout'] = budget_timeout(kwargs['timeout'], max_time)
+        session = self.session
+        started = time.perf_counter()
+        _budget.active = max_time is not None
+        try:
+            response = session.request(method, self.url_for(endpoint, **(path_params or {})), **kwargs)
+        except requests.exceptions.Timeout:
+            self.circuit_breaker.record_failure()
+            self.metrics.observe_request(endpoint, method, auth_metrics.TIMEOUT, time.perf_counter() - started)
+            raise
+        except requests.exceptions.ConnectionError:
+            self.circuit_breaker.record_failure()
+            self.metrics.observe_request(endpoint, method, auth_metrics.ERROR, time.perf_counter() - started)
+            raise
+        finally:
+            _budget.active = False
+        
+        if response.status_code in UNAVAILABLE_STATUSES:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        
+        body = response.request.body if response.request is not None else None
+        self.metrics.observe_request(
+            endpoint, method,
+            auth_metrics.SUCCESS if response.status_code < 400 else auth_metrics.ERROR,
+            time.perf_counter() - started,
+            status=response.status_code,
+            bytes_sent=len(body) if body else 0,
+            bytes_received=len(response.content)
+        )
+        return response
+    
+    def probe(self):
+        """Check that the API answers at all, bypassing the circuit breaker"""
+        import requests
+        
+        try:
+            response = self.session.get(self.url_for('probe'), timeout=self.timeouts['probe'])
+        except requests.exceptions.RequestException:
+            return False
+        return response.status_code not in UNAVAILABLE_STATUSES
+    
+    def get(self, endpoint, **kwargs):
+        return self.request('GET', endpoint, **kwargs)
+    
+    def post(self, endpoint, **kwargs):
+        return self.request('POST', endpoint, **kwargs)
+    
+    def put(self, endpoint, **kwargs):
+        return self.request('PUT', endpoint, **kwargs)
+    
+    def close(self):
+        if self._session is not None:
+            self._session.close()
\ No newline at end of file
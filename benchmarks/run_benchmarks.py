@@ -0,0 +1,297 @@
+"""Benchmarks for the LoginManager and PermissionManager hot paths.
+
+Every benchmark runs against StubTransport, so no network is needed, and
+the number of API calls it makes is counted. Results are compared with
+benchmarks/baseline.json: a benchmark fails when its API call count differs
+from the baseline at all.
+
+Timings are only gated with --timing. Each benchmark is then timed
+relative to a fixed pure-Python reference loop measured in the same run,
+interleaved with the benchmark's repeats, and fails when that ratio grows
+beyond the threshold. The ratio cancels most of the machine speed and load,
+unlike the absolute us/op, which is printed for information only. Refresh
+the baseline with --update-baseline after an intended change.
+
+Usage: python benchmarks/run_benchmarks.py [--timing] [--threshold 0.5] [--repeat 5]
+           [--only NAME ...] [--update-baseline] [--output results.json]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+import check_import_time  # noqa: E402
+from auth.login_manager import LoginManager  # noqa: E402
+from auth.permission_manager import PermissionManager  # noqa: E402
+from benchmarks.stub_transport import StubTransport  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+DEFAULT_THRESHOLD = 0.5
+
+MENU_NAMES = ('Dashboard', 'Input Data Muda-Mudi', 'Manajemen Kegiatan', 'Scan QR Absensi',
+              'Pencarian Data', 'Laporan', 'Gabung Database')
+MENU_KEYS = ('dashboard', 'input_data', 'manajemen_kegiatan', 'scan_qr', 'pencarian_data',
+             'laporan', 'gabung_database')
+
+# Large regional account: hundreds of areas in the filter clause
+AREA_COUNT = 300
+ROW_COUNT = 100000
+
+BENCHMARKS = []
+
+
+def benchmark(name, threshold=None):
+    def register(fn):
+        BENCHMARKS.append((name, fn, threshold))
+        return fn
+    return register
+
+
+class Session:
+    """A logged-in LoginManager/PermissionManager pair on a stub transport"""
+    
+    def __init__(self):
+        self.workdir = tempfile.mkdtemp(prefix='auth-bench-')
+        user = {
+            'id': 2,
+            'username': 'bench_admin',
+            'role': 'admin_desa',
+            'assigned_desa': [f"DESA {i:03d}" for i in range(AREA_COUNT)],
+            'assigned_kelompok': [f"KELOMPOK {i:03d}" for i in range(AREA_COUNT)]
+        }
+        permissions = {
+            name: {'can_view': True, 'can_create': i % 2 == 0, 'can_edit': i % 3 == 0, 'can_delete': False}
+            for i, name in enumerate(MENU_NAMES)
+        }
+        accessible_areas = {'desa': user['assigned_desa'], 'kelompok': user['assigned_kelompok']}
+        
+        self.transport = StubTransport(user, permissions, accessible_areas)
+        self.login_manager = LoginManager(
+            transport=self.transport,
+            revalidate_permissions_on_start=False,
+            token_file=os.path.join(self.workdir, 'auth_tokens.dat'),
+            key_file=os.path.join(self.workdir, 'auth.key')
+        )
+        self.login_manager.login(user['username'], 'password')
+        self.permission_manager = PermissionManager(self.login_manager)
+        self.transport.reset_calls()
+        
+        self.desa_options = [f"DESA {i:03d}" for i in range(AREA_COUNT * 2)] * 10
+        self.kelompok_options = [f"KELOMPOK {i:03d}" for i in range(AREA_COUNT * 2)] * 10
+        self.rows_desa = [f"DESA {i % (AREA_COUNT * 2):03d}" for i in range(ROW_COUNT)]
+        self.rows_kelompok = [f"KELOMPOK {(i * 7) % (AREA_COUNT * 2):03d}" for i in range(ROW_COUNT)]
+    
+    def close(self):
+        self.login_manager.transport.close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+@benchmark('has_permission')
+def bench_has_permission(session):
+    has_permission = session.login_manager.has_permission
+    for i in range(20000):
+        has_permission(MENU_NAMES[i % len(MENU_NAMES)], 'edit')
+    return 20000
+
+
+@benchmark('can_access_menu')
+def bench_can_access_menu(session):
+    can_access_menu = session.permission_manager.can_access_menu
+    for i in range(20000):
+        can_access_menu(MENU_KEYS[i % len(MENU_KEYS)])
+    return 20000
+
+
+@benchmark('filter_desa_options')
+def bench_filter_desa_options(session):
+    for _ in range(50):
+        session.permission_manager.filter_desa_options(session.desa_options)
+    return 50
+
+
+@benchmark('filter_kelompok_options')
+def bench_filter_kelompok_options(session):
+    for _ in range(50):
+        session.permission_manager.filter_kelompok_options(session.kelompok_options)
+    return 50
+
+
+@benchmark('get_data_filter_clause')
+def bench_get_data_filter_clause(session):
+    for _ in range(1000):
+        session.permission_manager.get_data_filter_clause()
+    return 1000
+
+
+@benchmark('can_access_participant_data')
+def bench_can_access_participant_data(session):
+    can_access = session.permission_manager.can_access_participant_data
+    for desa, kelompok in zip(session.rows_desa, session.rows_kelompok):
+        can_access(desa, kelompok)
+    return ROW_COUNT
+
+
+@benchmark('scan_session_authorize')
+def bench_scan_session_authorize(session):
+    scan_session = session.permission_manager.scan_session()
+    authorize = scan_session.authorize
+    for desa, kelompok in zip(session.rows_desa, session.rows_kelompok):
+        authorize(desa, kelompok)
+    return ROW_COUNT
+
+
+@benchmark('authorize_rows')
+def bench_authorize_rows(session):
+    session.permission_manager.authorize_rows(session.rows_desa, session.rows_kelompok)
+    return 1
+
+
+@benchmark('save_load_tokens')
+def bench_save_load_tokens(session):
+    for _ in range(50):
+        session.login_manager._save_tokens()
+        session.login_manager._load_tokens()
+    return 50
+
+
+@benchmark('cold_import', threshold=1.0)
+def bench_cold_import(session):
+    # Timed by -X importtime in a fresh interpreter, not by the wall clock
+    elapsed_ms, _ = check_import_time.measure()
+    return 1, elapsed_ms / 1000
+
+
+def reference_loop():
+    """Fixed interpreter workload (dict lookups, string formatting) the timings are scaled by"""
+    table = {f"AREA {i:03d}": i for i in range(500)}
+    total = 0
+    for _ in range(50):
+        for i in range(1000):
+            key = f"AREA {i % 700:03d}"
+            if key in table:
+                total += table[key]
+    return 50000
+
+
+def _time_reference():
+    started = time.perf_counter()
+    ops = reference_loop()
+    return (time.perf_counter() - started) / ops
+
+
+def run(names=None, repeat=5):
+    """Return {name: {'per_op_us', 'relative', 'ops', 'network_calls'}} for each benchmark
+    
+    `relative` is the time per operation divided by the reference loop's,
+    both the best of `repeat` interleaved runs.
+    """
+    results = {}
+    session = Session()
+    try:
+        for name, fn, threshold in BENCHMARKS:
+            if names and name not in names:
+                continue
+            
+            fn(session)  # Warm-up: fills caches and imports lazy dependencies
+            timings = []
+            reference = []
+            calls = set()
+            for _ in range(repeat):
+                reference.append(_time_reference())
+                session.transport.reset_calls()
+                started = time.perf_counter()
+                ops = fn(session)
+                elapsed = time.perf_counter() - started
+                if isinstance(ops, tuple):
+                    ops, elapsed = ops
+                timings.append(elapsed / ops)
+                calls.add(session.transport.call_count)
+            
+            results[name] = {
+                'per_op_us': round(min(timings) * 1e6, 3),
+                'relative': round(min(timings) / min(reference), 3),
+                'ops': ops,
+                'network_calls': max(calls)
+            }
+            if threshold is not None:
+                results[name]['threshold'] = threshold
+    finally:
+        session.close()
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, timing=False):
+    """Return a list of regression messages; timings only count with `timing`"""
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        
+        if result['network_calls'] != expected['network_calls']:
+            failures.append(f"{name}: {result['network_calls']} API calls per run, "
+                            f"baseline {expected['network_calls']}")
+        
+        if not timing or 'relative' not in expected:
+            continue
+        limit = expected['relative'] * (1 + expected.get('threshold', threshold))
+        if result['relative'] > limit:
+            failures.append(f"{name}: {result['relative']:.3f}x the reference loop exceeds "
+                            f"{limit:.3f}x (baseline {expected['relative']:.3f}x)")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--timing', action='store_true',
+                        help='also fail on timing regressions, not only on API call counts')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown as a fraction of the baseline (with --timing)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', nargs='+', metavar='NAME')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+    
+    results = run(args.only, args.repeat)
+    
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    
+    print(f"{'benchmark':<30} {'us/op':>12} {'relative':>10} {'baseline':>10} {'calls':>6}")
+    for name, result in results.items():
+        expected = baseline.get(name, {}).get('relative')
+        print(f"{name:<30} {result['per_op_us']:>12.3f} {result['relative']:>10.3f} "
+              f"{expected if expected is not None else '-':>10} {result['network_calls']:>6}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    
+    failures = compare(results, baseline, args.threshold, args.timing)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""In-process stand-in for AuthTransport that counts every API call."""
+import base64
+import json
+import time
+
+from auth.circuit_breaker import CircuitBreaker
+from auth.metrics import AuthMetrics
+
+
+def make_token(ttl=1800, **claims):
+    """Unsigned JWT with iat/exp claims, enough for local validation"""
+    def encode(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+    
+    now = int(time.time())
+    claims.update({'iat': now, 'exp': now + ttl})
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(claims)}.signature"
+
+
+class StubResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+        self.content = json.dumps(payload).encode() if payload is not None else b''
+    
+    def json(self):
+        return self._payload
+
+
+class StubTransport:
+    """Answers the auth endpoints from memory and records each call"""
+    
+    def __init__(self, user, permissions, accessible_areas, ttl=1800):
+        self.user = user
+        self.permissions = permissions
+        self.accessible_areas = accessible_areas
+        self.ttl = ttl
+        self.calls = []
+        self.circuit_breaker = CircuitBreaker()
+        self.metrics = AuthMetrics()
+    
+    @property
+    def call_count(self):
+        return len(self.calls)
+    
+    def reset_calls(self):
+        self.calls = []
+    
+    def request(self, method, endpoint, **kwargs):
+        self.calls.append((method, endpoint))
+        token = make_token(self.ttl, userId=self.user['id'], role=self.user['role'])
+        
+        if endpoint == 'login':
+            return StubResponse(200, {'success': True, 'data': {
+                'access_token': token, 'refresh_token': make_token(7 * 24 * 3600), 'user': self.user
+            }})
+        if endpoint == 'refresh':
+            return StubResponse(200, {'success': True, 'data': {'access_token': token, 'user': self.user}})
+        if endpoint == 'verify':
+            return StubResponse(200, {'success': True, 'valid': True, 'user': self.user})
+        if endpoint == 'permissions':
+            return StubResponse(200, {'success': True, 'data': {
+                'user': self.user,
+                'permissions': self.permissions,
+                'accessible_areas': self.accessible_areas
+            }}, {'ETag': '"stub"'})
+        return StubResponse(404, {'error': 'Not found'})
+    
+    def get(self, endpoint, **kwargs):
+        return self.request('GET', endpoint, **kwargs)
+    
+    def post(self, endpoint, **kwargs):
+        return self.request('POST', endpoint, **kwargs)
+    
+    def probe(self):
+        self.calls.append(('GET', 'probe'))
+        return True
+    
+    def close(self):
+        pass
\ No newline at end of file
@@ -37,6 +37,16 @@ CREATE TABLE role_permissions (
     UNIQUE(role, menu_name)
 );
 
+-- Area catalog: every desa and kelompok (kelompok.desa is NULL while unknown)
+CREATE TABLE desa (
+    name TEXT PRIMARY KEY
+);
+
+CREATE TABLE kelompok (
+    name TEXT PRIMARY KEY,
+    desa TEXT REFERENCES desa(name)
+);
+
 -- Insert default role permissions
 INSERT INTO role_permissions (role, menu_name, can_view, can_create, can_edit, can_delete) VALUES
 -- Super Admin - Full access to everything
@@ -70,6 +80,49 @@ INSERT INTO role_permissions (role, menu_name, can_view, can_create, can_edit, c
 ('admin_kelompok', 'Scan QR Absensi', TRUE, TRUE, FALSE, FALSE),
 ('admin_kelompok', 'Pencarian Data', TRUE, FALSE, FALSE, FALSE);
 
+-- Insert area catalog
+INSERT INTO desa (name) VALUES
+('BANDARA'),
+('CENGKARENG'),
+('CIPONDOH'),
+('JELAMBAR'),
+('KALIDERES'),
+('KEBON JAHE'),
+('TAMAN KOTA'),
+('KAPUK MELATI');
+
+INSERT INTO kelompok (name, desa) VALUES
+('TEGAL ALUR A', NULL),
+('TEGAL ALUR B', NULL),
+('PREPEDAN A', NULL),
+('PREPEDAN B', NULL),
+('KEBON KELAPA', NULL),
+('PRIMA', 'BANDARA'),
+('RAWA LELE', 'BANDARA'),
+('KAMPUNG DURI', 'BANDARA'),
+('FAJAR A', 'CENGKARENG'),
+('FAJAR B', 'CENGKARENG'),
+('FAJAR C', 'CENGKARENG'),
+('DAMAI', NULL),
+('JAYA', NULL),
+('INDAH', NULL),
+('PEJAGALAN', NULL),
+('BGN', NULL),
+('MELATI A', NULL),
+('MELATI B', NULL),
+('GRIYA PERMATA', NULL),
+('SEMANAN A', NULL),
+('SEMANAN B', NULL),
+('PONDOK BAHAR', NULL),
+('KEBON JAHE A', NULL),
+('KEBON JAHE B', NULL),
+('GARIKAS', NULL),
+('TANIWAN', NULL),
+('TAMAN KOTA A', NULL),
+('TAMAN KOTA B', NULL),
+('RAWA BUAYA A', NULL),
+('RAWA BUAYA B', NULL);
+
 -- Insert default super admin user (password: admin123)
 INSERT INTO users (username, password_hash, email, role, assigned_desa, assigned_kelompok, status) VALUES
 ('superadmin', '$2a$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewdBPj/VcSAg/9qm', 'admin@mudaii.com', 'super_admin', '{}', '{}', 'active');
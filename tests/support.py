@@ -0,0 +1,35 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from auth.login_manager import LoginManager  # noqa: E402
+from auth.permission_manager import PermissionManager  # noqa: E402
+from benchmarks.stub_transport import StubTransport  # noqa: E402
+
+MENU_PERMISSIONS = {
+    'Dashboard': {'can_view': True, 'can_create': False, 'can_edit': False, 'can_delete': False},
+    'Scan QR Absensi': {'can_view': True, 'can_create': True, 'can_edit': False, 'can_delete': False}
+}
+
+
+def logged_in_session(role='admin_desa', desa=('BANDARA',), kelompok=('PRIMA', 'RAWA LELE'),
+                      permissions=None, **manager_options):
+    """(LoginManager, PermissionManager, StubTransport) for a user logged in without network"""
+    user = {
+        'id': 2,
+        'username': 'test_admin',
+        'role': role,
+        'assigned_desa': list(desa),
+        'assigned_kelompok': list(kelompok)
+    }
+    transport = StubTransport(user, permissions or MENU_PERMISSIONS,
+                              {'desa': list(desa), 'kelompok': list(kelompok)})
+    manager_options.setdefault('token_file', None)
+    manager_options.setdefault('revalidate_permissions_on_start', False)
+    login_manager = LoginManager(transport=transport, **manager_options)
+    login_manager.login(user['username'], 'password')
+    transport.reset_calls()
+    return login_manager, PermissionManager(login_manager), transport
\ No newline at end of file
@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import requests
+
+from support import logged_in_session
+
+from auth.admin_client import AdminClient, read_users_csv
+from benchmarks.stub_transport import StubResponse
+
+OK = StubResponse(200, {'success': True, 'data': {'id': 7}})
+
+
+def scripted(transport, outcomes):
+    """Answer admin endpoints with `outcomes` in order: a status code or an exception"""
+    request = transport.request
+    outcomes = list(outcomes)
+    
+    def admin_request(method, endpoint, **kwargs):
+        if endpoint not in ('create_user', 'update_user', 'list_users'):
+            return request(method, endpoint, **kwargs)
+        transport.calls.append((method, endpoint))
+        outcome = outcomes.pop(0) if outcomes else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+        if outcome == 200:
+            return OK
+        return StubResponse(outcome, {'success': False, 'error': f"HTTP {outcome}"})
+    
+    transport.request = admin_request
+
+
+def connect_refused():
+    """ConnectionError as requests raises it when the TCP connect is refused"""
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+    reason = NewConnectionError(None, 'Connection refused')
+    return requests.exceptions.ConnectionError(MaxRetryError(None, '/api/user/create', reason))
+
+
+class CallRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.login_manager, _, self.transport = logged_in_session(role='super_admin')
+        self.client = AdminClient(self.login_manager, max_retries=3, backoff_factor=0)
+    
+    def calls(self, method, endpoint):
+        return self.transport.calls.count((method, endpoint))
+    
+    def test_post_is_not_retried_when_it_may_have_been_committed(self):
+        for outcome in (500, 502, 504):
+            with self.subTest(outcome=outcome):
+                self.transport.reset_calls()
+                scripted(self.transport, [outcome])
+                response, attempts = self.client._call('POST', 'create_user', json={})
+                self.assertEqual((response.status_code, attempts), (outcome, 1))
+                self.assertEqual(self.calls('POST', 'create_user'), 1)
+    
+    def test_post_read_timeout_is_not_retried(self):
+        scripted(self.transport, [requests.exceptions.ReadTimeout()])
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.client._call('POST', 'create_user', json={})
+        self.assertEqual(self.calls('POST', 'create_user'), 1)
+    
+    def test_post_is_retried_when_it_was_not_processed(self):
+        self.client.max_retries = 4
+        scripted(self.transport, [429, 503, requests.exceptions.ConnectTimeout(), connect_refused()])
+        response, attempts = self.client._call('POST', 'create_user', json={})
+        self.assertEqual((response.status_code, attempts), (200, 5))
+    
+    def test_idempotent_requests_are_retried(self):
+        scripted(self.transport, [500, requests.exceptions.ReadTimeout(), 502])
+        response, attempts = self.client._call('PUT', 'update_user', path_params={'id': 7}, json={})
+        self.assertEqual((response.status_code, attempts), (200, 4))
+    
+    def test_retries_are_bounded(self):
+        scripted(self.transport, [503] * 10)
+        response, attempts = self.client._call('GET', 'list_users')
+        self.assertEqual((response.status_code, attempts), (503, 4))
+
+
+class BulkUpdateCsvTest(unittest.TestCase):
+    def setUp(self):
+        self.login_manager, _, self.transport = logged_in_session(role='super_admin')
+        self.client = AdminClient(self.login_manager, max_workers=2, backoff_factor=0)
+        self.workdir = tempfile.mkdtemp(prefix='auth-test-')
+        self.addCleanup(shutil.rmtree, self.workdir, True)
+    
+    def write_csv(self, text):
+        path = os.path.join(self.workdir, 'users.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+    
+    def test_malformed_id_fails_only_its_row(self):
+        path = self.write_csv("id,username,email\n7,a,a@x\nx12,b,b@x\n8,c,c@x\n")
+        self.assertEqual([row['id'] for row in read_users_csv(path)], [7, 'x12', 8])
+        scripted(self.transport, [])
+        
+        results = self.client.bulk_update_csv(path)
+        self.assertEqual([result.success for result in results], [True, False, True])
+        self.assertIn('id tidak valid', results[1].error)
+        self.assertEqual(self.transport.calls.count(('PUT', 'update_user')), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
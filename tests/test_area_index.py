@@ -0,0 +1,63 @@
+import unittest
+
+from support import logged_in_session
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    np = pd = None
+
+DESA = ['BANDARA', 'CENGKARENG', '', None, float('nan'), 'BANDARA', 'BANDARA', None]
+KELOMPOK = ['PRIMA', 'PRIMA', 'FAJAR A', 'RAWA LELE', 'PRIMA', '', float('nan'), 'FAJAR A']
+
+
+@unittest.skipIf(pd is None, "pandas and numpy are required")
+class AuthorizeRowsMissingValuesTest(unittest.TestCase):
+    """authorize_rows must agree with can_access_participant_data row by row"""
+    
+    def setUp(self):
+        self.login_manager, self.permission_manager, self.transport = logged_in_session()
+    
+    def expected(self, desa, kelompok):
+        return [self.permission_manager.can_access_participant_data(d, k) for d, k in zip(desa, kelompok)]
+    
+    def test_lists(self):
+        self.assertEqual(self.permission_manager.authorize_rows(DESA, KELOMPOK),
+                         self.expected(DESA, KELOMPOK))
+    
+    def test_object_arrays(self):
+        desa = np.array(DESA, dtype=object)
+        kelompok = np.array(KELOMPOK, dtype=object)
+        mask = self.permission_manager.authorize_rows(desa, kelompok)
+        self.assertEqual(mask.tolist(), self.expected(DESA, KELOMPOK))
+    
+    def test_dataframe_dtypes(self):
+        frame = pd.DataFrame({'desa': DESA, 'kelompok': KELOMPOK})
+        variants = {
+            'object': frame,
+            'convert_dtypes': frame.convert_dtypes(),
+            'string': frame.astype('string'),
+            'pd.NA object': frame.astype(object).where(frame.notna(), pd.NA)
+        }
+        for name, data in variants.items():
+            with self.subTest(dtype=name):
+                desa = data['desa'].tolist()
+                kelompok = data['kelompok'].tolist()
+                mask = self.permission_manager.authorize_rows(data)
+                self.assertEqual(mask.tolist(), self.expected(desa, kelompok))
+                self.assertTrue(mask.index.equals(data.index))
+    
+    def test_missing_values_are_not_checked(self):
+        for value in ('', None, float('nan'), pd.NA):
+            with self.subTest(value=value):
+                self.assertTrue(self.permission_manager.can_access_participant_data(value, 'PRIMA'))
+                self.assertFalse(self.permission_manager.can_access_participant_data(value, 'FAJAR A'))
+    
+    def test_no_network_calls(self):
+        self.permission_manager.authorize_rows(pd.DataFrame({'desa': DESA, 'kelompok': KELOMPOK}))
+        self.assertEqual(self.transport.call_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,56 @@
+import unittest
+
+from support import ROOT  # noqa: F401
+
+from auth.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        events = []
+        breaker.listeners.append(events.append)
+        
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertTrue(breaker.allow_request())
+        
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow_request())
+        self.assertEqual(events, [OPEN])
+    
+    def test_half_open_trial_closes_on_success(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        events = []
+        breaker.listeners.append(events.append)
+        breaker.record_failure()
+        
+        self.assertTrue(breaker.allow_request())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow_request())  # Only one trial call
+        
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.failure_count, 0)
+        self.assertFalse(breaker.last_call_failed)
+        self.assertEqual(events, [OPEN, CLOSED])
+    
+    def test_half_open_trial_reopens_on_failure(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0)
+        for _ in range(3):
+            breaker.record_failure()
+        
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+    
+    def test_probe_closes_the_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60, probe=lambda: True, probe_interval=0.01)
+        breaker.record_failure()
+        breaker._probe_thread.join(5)
+        self.assertEqual(breaker.state, CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
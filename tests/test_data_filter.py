@@ -0,0 +1,78 @@
+import sqlite3
+import unittest
+
+from support import logged_in_session
+
+ROWS = [
+    ('BANDARA', 'PRIMA'), ('BANDARA', 'FAJAR A'), ('CENGKARENG', 'RAWA LELE'),
+    ('CENGKARENG', 'FAJAR B'), ('KALIDERES', "KAMPUNG D'URI"), (None, None)
+]
+
+
+class DataFilterParamsTest(unittest.TestCase):
+    def setUp(self):
+        self.login_manager, self.permission_manager, self.transport = logged_in_session(
+            desa=('BANDARA',), kelompok=('RAWA LELE', "KAMPUNG D'URI"))
+        self.db = sqlite3.connect(':memory:')
+        self.addCleanup(self.db.close)
+        self.db.execute("CREATE TABLE peserta (desa TEXT, kelompok TEXT)")
+        self.db.executemany("INSERT INTO peserta VALUES (?, ?)", ROWS)
+    
+    def select(self, clause, params=()):
+        return self.db.execute(f"SELECT desa, kelompok FROM peserta WHERE {clause} ORDER BY rowid",
+                               params).fetchall()
+    
+    def test_matches_the_inline_clause(self):
+        clause, params = self.permission_manager.get_data_filter_params()
+        self.assertEqual(clause, "desa IN (?) OR kelompok IN (?,?)")
+        self.assertEqual(params, ('BANDARA', 'RAWA LELE', "KAMPUNG D'URI"))
+        self.assertEqual(self.select(clause, params), [
+            ('BANDARA', 'PRIMA'), ('BANDARA', 'FAJAR A'), ('CENGKARENG', 'RAWA LELE'),
+            ('KALIDERES', "KAMPUNG D'URI")
+        ])
+    
+    def test_format_paramstyle(self):
+        clause, params = self.permission_manager.get_data_filter_params('format')
+        self.assertEqual(clause, "desa IN (%s) OR kelompok IN (%s,%s)")
+        with self.assertRaises(ValueError):
+            self.permission_manager.get_data_filter_params('named')
+    
+    def test_large_lists_as_array_parameter(self):
+        clause, params = self.permission_manager.get_data_filter_params(large_list_threshold=1)
+        self.assertEqual(clause, "desa IN (?) OR kelompok = ANY(?)")
+        self.assertEqual(params, ('BANDARA', ['RAWA LELE', "KAMPUNG D'URI"]))
+        with self.assertRaises(ValueError):
+            self.permission_manager.get_data_filter_params(large_list_threshold=1, large_list_form='cte')
+    
+    def test_large_lists_through_temp_tables(self):
+        cursor = self.db.cursor()
+        for _ in range(2):  # Refilled, not duplicated
+            self.permission_manager.create_area_temp_tables(cursor)
+        clause, params = self.permission_manager.get_data_filter_params(
+            large_list_threshold=0, large_list_form='temp_table')
+        
+        self.assertEqual(params, ())
+        self.assertEqual(self.select(clause), self.select(*self.permission_manager.get_data_filter_params()))
+        self.assertEqual(self.db.execute("SELECT COUNT(*) FROM accessible_kelompok").fetchone(), (2,))
+    
+    def test_cached_until_the_areas_change(self):
+        first = self.permission_manager.get_data_filter_params()
+        self.assertIs(self.permission_manager.get_data_filter_params(), first)
+        self.assertEqual(self.transport.call_count, 0)
+        
+        self.login_manager._apply_permissions(self.login_manager.permissions,
+                                              {'desa': ['CENGKARENG'], 'kelompok': []})
+        self.assertEqual(self.permission_manager.get_data_filter_params(), ("desa IN (?)", ('CENGKARENG',)))
+    
+    def test_full_and_no_access(self):
+        _, permission_manager, _ = logged_in_session(role='super_admin', desa=(), kelompok=())
+        self.assertEqual(permission_manager.get_data_filter_params(), ("1=1", ()))
+        
+        self.login_manager._apply_permissions(self.login_manager.permissions, {'desa': [], 'kelompok': []})
+        self.assertEqual(self.permission_manager.get_data_filter_params(), ("1=0", ()))
+        self.login_manager.logout()
+        self.assertEqual(self.permission_manager.get_data_filter_params(), ("1=0", ()))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from support import ROOT  # noqa: F401
+
+from auth.file_lock import FileLock
+
+
+class FileLockTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='auth-test-')
+        self.path = os.path.join(self.workdir, 'auth_tokens.dat.lock')
+    
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+    
+    def try_lock(self, timeout=0.1):
+        """Whether another FileLock on the same file can be taken from another thread"""
+        acquired = []
+        
+        def other():
+            try:
+                with FileLock(self.path, timeout=timeout):
+                    acquired.append(True)
+            except TimeoutError:
+                acquired.append(False)
+        
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join(5)
+        return acquired == [True]
+    
+    def test_reentrant_within_a_thread(self):
+        lock = FileLock(self.path)
+        with lock:
+            with lock:
+                self.assertFalse(self.try_lock())
+            # Still held by the outer block
+            self.assertFalse(self.try_lock())
+        self.assertTrue(self.try_lock())
+    
+    def test_released_after_exception(self):
+        lock = FileLock(self.path)
+        with self.assertRaises(RuntimeError):
+            with lock:
+                raise RuntimeError('refresh failed')
+        self.assertTrue(self.try_lock())
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
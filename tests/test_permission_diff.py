@@ -0,0 +1,87 @@
+import unittest
+
+from support import MENU_PERMISSIONS
+
+from auth.area_index import AreaIndex
+from auth.login_manager import LoginManager
+from auth.permission_diff import PermissionDiff
+from auth.permission_matrix import PermissionMatrix
+from benchmarks.stub_transport import StubResponse, StubTransport
+
+OLD_PERMISSIONS = {
+    'Dashboard': {'can_view': True},
+    'Laporan': {'can_view': True, 'can_create': True}
+}
+NEW_PERMISSIONS = {
+    'Dashboard': {'can_view': True, 'can_edit': True},
+    'Laporan': {'can_view': True}
+}
+
+
+def state(permissions, desa, kelompok):
+    user = {'role': 'admin_desa'}
+    return (PermissionMatrix.compile(permissions),
+            AreaIndex.build(user, {'desa': desa, 'kelompok': kelompok}))
+
+
+class PermissionDiffTest(unittest.TestCase):
+    def test_between(self):
+        old = state(OLD_PERMISSIONS, ['BANDARA'], ['PRIMA', 'RAWA LELE'])
+        new = state(NEW_PERMISSIONS, ['BANDARA'], ['PRIMA', 'KAMPUNG DURI'])
+        diff = PermissionDiff.between(*old, *new, generation=3)
+        
+        self.assertEqual(diff.gained, {'dashboard': frozenset({'edit'})})
+        self.assertEqual(diff.lost, {'laporan': frozenset({'create'})})
+        self.assertEqual(diff.changed_menus, {'dashboard', 'laporan'})
+        self.assertTrue(diff.affects_menu('laporan', 'create'))
+        self.assertFalse(diff.affects_menu('laporan', 'view'))
+        self.assertEqual((diff.kelompok_added, diff.kelompok_removed), (['KAMPUNG DURI'], ['RAWA LELE']))
+        self.assertEqual((diff.desa_added, diff.desa_removed), ([], []))
+        self.assertEqual(diff.to_dict()['generation'], 3)
+        self.assertTrue(diff)
+    
+    def test_no_changes(self):
+        diff = PermissionDiff.between(*state(OLD_PERMISSIONS, ['BANDARA'], ['PRIMA']),
+                                      *state(OLD_PERMISSIONS, ['BANDARA'], ['PRIMA']))
+        self.assertFalse(diff)
+        self.assertFalse(diff.areas_changed)
+        self.assertEqual(repr(diff), 'PermissionDiff(no changes)')
+
+
+
+class LoginDiffTest(unittest.TestCase):
+    def login(self, permissions_status=200):
+        user = {'id': 3, 'username': 'admin_bandara', 'role': 'admin_desa',
+                'assigned_desa': ['BANDARA'], 'assigned_kelompok': ['PRIMA']}
+        transport = StubTransport(user, MENU_PERMISSIONS, {'desa': ['BANDARA'], 'kelompok': ['PRIMA']})
+        if permissions_status != 200:
+            request = transport.request
+            transport.request = lambda method, endpoint, **kwargs: (
+                StubResponse(permissions_status, {'error': 'unavailable'}) if endpoint == 'permissions'
+                else request(method, endpoint, **kwargs))
+        
+        login_manager = LoginManager(transport=transport, token_file=None,
+                                     revalidate_permissions_on_start=False,
+                                     permission_retry_delays=(60,))
+        self.addCleanup(login_manager.logout)
+        diffs = []
+        login_manager.add_permission_listener(diffs.append)
+        login_manager.login(user['username'], 'password')
+        return login_manager, diffs
+    
+    def test_one_diff_per_login(self):
+        login_manager, diffs = self.login()
+        self.assertEqual(len(diffs), 1)
+        self.assertEqual(diffs[0].generation, login_manager.session_generation)
+        self.assertFalse(diffs[0].lost)
+        self.assertEqual(diffs[0].gained['scan_qr'], frozenset({'view', 'create'}))
+    
+    def test_one_diff_when_the_fetch_fails(self):
+        login_manager, diffs = self.login(permissions_status=500)
+        self.assertEqual(login_manager.permissions_source, 'role_defaults')
+        self.assertEqual(len(diffs), 1)
+        self.assertFalse(diffs[0].lost)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
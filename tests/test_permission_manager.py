@@ -0,0 +1,71 @@
+import unittest
+
+from support import logged_in_session
+
+
+class MenuPermissionsTest(unittest.TestCase):
+    def setUp(self):
+        self.login_manager, self.permission_manager, self.transport = logged_in_session()
+    
+    def test_mapped_menus_follow_the_payload(self):
+        self.assertTrue(self.permission_manager.can_access_menu('dashboard'))
+        self.assertFalse(self.permission_manager.can_create_data('dashboard'))
+        self.assertTrue(self.permission_manager.can_create_data('scan_qr'))
+        # Mapped but missing from the payload
+        self.assertFalse(self.permission_manager.can_access_menu('laporan'))
+    
+    def test_menu_added_to_the_manager_mapping_is_denied(self):
+        permission_manager = self.permission_manager
+        permission_manager.menu_permissions = dict(permission_manager.menu_permissions,
+                                                   manajemen_user='Manajemen User')
+        self.assertFalse(self.login_manager.has_permission('Manajemen User'))
+        for check in (permission_manager.can_access_menu, permission_manager.can_create_data,
+                      permission_manager.can_edit_data, permission_manager.can_delete_data):
+            with self.subTest(check=check.__name__):
+                self.assertFalse(check('manajemen_user'))
+        self.assertEqual(permission_manager.get_menu_actions()['manajemen_user'], frozenset())
+    
+    def test_unmapped_menus_are_allowed(self):
+        self.assertTrue(self.permission_manager.can_access_menu('tentang'))
+        self.assertNotIn('tentang', self.permission_manager.get_menu_actions())
+    
+    def test_mapping_change_is_not_served_from_cache(self):
+        permission_manager = self.permission_manager
+        self.assertTrue(permission_manager.can_access_menu('manajemen_user'))
+        permission_manager.menu_permissions = dict(permission_manager.menu_permissions,
+                                                   manajemen_user='Manajemen User')
+        self.assertFalse(permission_manager.can_access_menu('manajemen_user'))
+
+
+
+class DecisionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.login_manager, self.permission_manager, self.transport = logged_in_session()
+    
+    def grant_laporan(self):
+        permissions = dict(self.login_manager.permissions, Laporan={'can_view': True})
+        self.login_manager._apply_permissions(permissions, self.login_manager.accessible_areas)
+    
+    def test_new_generation_drops_cached_decisions(self):
+        self.assertFalse(self.permission_manager.can_access_menu('laporan'))
+        self.assertFalse(self.permission_manager.can_access_menu('laporan'))
+        self.assertEqual(self.permission_manager.cache_hits, 1)
+        
+        generation = self.login_manager.session_generation
+        self.grant_laporan()
+        self.assertGreater(self.login_manager.session_generation, generation)
+        self.assertTrue(self.permission_manager.can_access_menu('laporan'))
+        self.assertEqual(self.transport.call_count, 0)
+    
+    def test_decision_computed_during_a_rebuild_is_not_cached(self):
+        def stale_decision():
+            decision = self.login_manager.permission_matrix.allows_name('Laporan')
+            self.grant_laporan()  # A background revalidation lands meanwhile
+            return decision
+        
+        self.assertFalse(self.permission_manager._cached('view', 'laporan', stale_decision))
+        self.assertTrue(self.permission_manager.can_access_menu('laporan'))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
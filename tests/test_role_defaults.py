@@ -0,0 +1,89 @@
+import time
+import unittest
+
+from support import logged_in_session
+
+from auth.login_manager import LoginManager
+from benchmarks.stub_transport import StubResponse, StubTransport
+
+USER = {
+    'id': 4,
+    'username': 'admin_prima',
+    'role': 'admin_kelompok',
+    'assigned_desa': ['BANDARA'],
+    'assigned_kelompok': ['PRIMA']
+}
+# The database revoked "Input Data Muda-Mudi" from this user
+SERVER_PERMISSIONS = {'Dashboard': {'can_view': True}}
+
+
+class FlakyPermissionsTransport(StubTransport):
+    """Answers the permissions endpoint with 500 for the first `failures` calls"""
+    
+    def __init__(self, failures):
+        super().__init__(USER, SERVER_PERMISSIONS, {'desa': ['BANDARA'], 'kelompok': ['PRIMA']})
+        self.failures = failures
+    
+    def request(self, method, endpoint, **kwargs):
+        if endpoint == 'permissions' and self.failures:
+            self.failures -= 1
+            self.calls.append((method, endpoint))
+            return StubResponse(500, {'error': 'unavailable'})
+        return super().request(method, endpoint, **kwargs)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class RoleDefaultsRetryTest(unittest.TestCase):
+    def login(self, failures, retry_delays=(0.01, 0.02)):
+        transport = FlakyPermissionsTransport(failures)
+        login_manager = LoginManager(transport=transport, token_file=None,
+                                     revalidate_permissions_on_start=False,
+                                     permission_retry_delays=retry_delays)
+        self.addCleanup(login_manager.logout)
+        self.assertTrue(login_manager.login(USER['username'], 'password')[0])
+        return login_manager, transport
+    
+    def test_failed_fetch_at_login_is_retried(self):
+        login_manager, transport = self.login(failures=3)
+        self.assertEqual(login_manager.permissions_source, 'role_defaults')
+        self.assertTrue(login_manager.has_permission('Input Data Muda-Mudi', 'create'))
+        
+        self.assertTrue(wait_for(lambda: login_manager.permissions_source == 'server'))
+        self.assertFalse(login_manager.has_permission('Input Data Muda-Mudi', 'create'))
+        self.assertEqual(transport.calls.count(('GET', 'permissions')), 4)
+        self.assertIsNone(login_manager._permission_retry)
+    
+    def test_no_retry_once_the_server_snapshot_arrived(self):
+        login_manager, _, transport = logged_in_session()
+        self.assertEqual(login_manager.permissions_source, 'server')
+        self.assertIsNone(login_manager._permission_retry)
+    
+    def test_logout_cancels_the_retry(self):
+        login_manager, transport = self.login(failures=100, retry_delays=(60,))
+        self.assertIsNotNone(login_manager._permission_retry)
+        login_manager.logout()
+        self.assertIsNone(login_manager._permission_retry)
+    
+    def test_no_retry_while_the_breaker_is_open(self):
+        login_manager, transport = self.login(failures=100, retry_delays=(60,))
+        login_manager._cancel_permission_retry()
+        for _ in range(transport.circuit_breaker.failure_threshold):
+            transport.circuit_breaker.record_failure()
+        
+        login_manager._schedule_permission_retry()
+        self.assertIsNone(login_manager._permission_retry)
+        
+        # Back online: the next successful refresh schedules the fetch again
+        transport.circuit_breaker.record_success()
+        self.assertTrue(login_manager.refresh_access_token())
+        self.assertIsNotNone(login_manager._permission_retry)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import time
+import unittest
+
+from support import logged_in_session
+
+from auth.login_manager import LoginManager
+
+
+class RacingLoginManager(LoginManager):
+    """Runs `race` right after the area index is read, like a revalidation landing then"""
+    
+    race = None
+    
+    @property
+    def area_index(self):
+        index = self.__dict__['area_index']
+        race, self.race = self.race, None
+        if race:
+            race()
+        return index
+    
+    @area_index.setter
+    def area_index(self, value):
+        self.__dict__['area_index'] = value
+
+
+class ScanSessionGenerationTest(unittest.TestCase):
+    def setUp(self):
+        self.login_manager, self.permission_manager, self.transport = logged_in_session()
+        self.scan_session = self.permission_manager.scan_session()
+    
+    def add_kelompok(self, name):
+        areas = dict(self.login_manager.accessible_areas)
+        areas['kelompok'] = list(areas['kelompok']) + [name]
+        self.login_manager._apply_permissions(self.login_manager.permissions, areas)
+    
+    def test_permission_change_renews_the_snapshot(self):
+        self.assertFalse(self.scan_session.authorize('BANDARA', 'KAMPUNG DURI'))
+        self.add_kelompok('KAMPUNG DURI')
+        self.assertTrue(self.scan_session.authorize('BANDARA', 'KAMPUNG DURI'))
+    
+    def test_change_while_renewing_is_not_missed(self):
+        login_manager = self.login_manager
+        login_manager.__class__ = RacingLoginManager
+        login_manager.race = lambda: self.add_kelompok('KAMPUNG DURI')
+        self.scan_session.renew()
+        
+        self.assertFalse(self.scan_session.is_current())
+        self.assertTrue(self.scan_session.authorize('BANDARA', 'KAMPUNG DURI'))
+
+
+
+class DeniedSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.login_manager, self.permission_manager, self.transport = logged_in_session()
+    
+    def renew_during_outage(self, scan_session):
+        # Tokens are kept but is_logged_in() fails, e.g. no offline session yet
+        self.login_manager.is_logged_in = lambda: False
+        try:
+            scan_session.renew()
+        finally:
+            del self.login_manager.is_logged_in
+    
+    def test_denied_snapshot_expires_quickly(self):
+        scan_session = self.permission_manager.scan_session(ttl=300)
+        self.renew_during_outage(scan_session)
+        
+        stats = scan_session.stats()
+        self.assertFalse(stats['can_scan'])
+        self.assertLessEqual(stats['expires_in'], 5)
+    
+    def test_scans_resume_after_the_outage(self):
+        scan_session = self.permission_manager.scan_session(ttl=300, denied_ttl=0.05)
+        self.renew_during_outage(scan_session)
+        self.assertFalse(scan_session.authorize('BANDARA', 'PRIMA'))
+        
+        time.sleep(0.1)
+        self.assertTrue(scan_session.authorize('BANDARA', 'PRIMA'))
+        self.assertGreater(scan_session.stats()['expires_in'], 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+import threading
+import time
+import unittest
+
+from support import logged_in_session
+
+from auth.singleflight import SingleFlight
+from benchmarks.stub_transport import make_token
+
+THREADS = 10
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_calls_share_one_result(self):
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+        
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'token'
+        
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do('refresh', slow)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flight.do('refresh', slow)))
+                     for _ in range(THREADS - 1)]
+        for thread in followers:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['token'] * THREADS)
+        self.assertFalse(flight.in_flight('refresh'))
+    
+    def test_error_reaches_every_waiter_and_is_not_cached(self):
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do('refresh', self.fail_with_value_error)
+        self.assertEqual(flight.do('refresh', lambda: 'ok'), 'ok')
+    
+    @staticmethod
+    def fail_with_value_error():
+        raise ValueError('refresh failed')
+
+
+class ExpiredTokenRefreshTest(unittest.TestCase):
+    def test_threads_with_expired_token_refresh_once(self):
+        login_manager, _, transport = logged_in_session()
+        login_manager.access_token = make_token(-60, userId=2, role='admin_desa')
+        login_manager._save_tokens()  # Otherwise the valid stored token is adopted
+        
+        request = transport.request
+        
+        def slow_request(method, endpoint, **kwargs):
+            if endpoint == 'refresh':
+                time.sleep(0.2)
+            return request(method, endpoint, **kwargs)
+        
+        transport.request = slow_request
+        barrier = threading.Barrier(THREADS)
+        results = []
+        
+        def check():
+            barrier.wait(5)
+            results.append(login_manager.is_logged_in())
+        
+        threads = [threading.Thread(target=check) for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        
+        self.assertEqual(results, [True] * THREADS)
+        self.assertEqual(transport.calls.count(('POST', 'refresh')), 1)
+        self.assertNotIn(('GET', 'verify'), transport.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
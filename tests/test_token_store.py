@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from support import logged_in_session
+
+from auth.token_store import FileTokenStore, SplitFileTokenStore, TokenStore
+
+TOKENS = {'access_token': 'access', 'refresh_token': 'refresh', 'user': {'id': 2}}
+SNAPSHOT = {
+    'permissions': {'Dashboard': {'can_view': True}},
+    'accessible_areas': {'desa': ['BANDARA'], 'kelompok': ['PRIMA']},
+    'permissions_etag': '"v1"',
+    'permissions_hash': 'hash-v1'
+}
+
+
+class DictTokenStore(TokenStore):
+    """Custom store relying on the base class lock"""
+    
+    def __init__(self):
+        super().__init__()
+        self.data = None
+    
+    def load(self):
+        return json.loads(self.data) if self.data else None
+    
+    def save(self, token_data):
+        self.data = json.dumps(token_data)
+    
+    def clear(self):
+        self.data = None
+
+
+class CustomTokenStoreTest(unittest.TestCase):
+    def test_base_class_provides_reentrant_lock(self):
+        store = DictTokenStore()
+        with store.lock:
+            with store.lock:
+                pass
+    
+    def test_refresh_with_custom_store(self):
+        login_manager, _, transport = logged_in_session(token_store=DictTokenStore())
+        self.assertTrue(login_manager.refresh_access_token())
+        self.assertIn(('POST', 'refresh'), transport.calls)
+        self.assertIsNone(login_manager.last_refresh_failure)
+
+
+class SplitFileTokenStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='auth-test-')
+        self.path = os.path.join(self.workdir, 'auth_tokens.dat')
+        self.key_file = os.path.join(self.workdir, 'auth.key')
+    
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+    
+    def store(self):
+        return SplitFileTokenStore(self.path, self.key_file)
+    
+    def test_round_trip(self):
+        self.store().save(dict(TOKENS, **SNAPSHOT))
+        self.assertEqual(self.store().load(), dict(TOKENS, **SNAPSHOT))
+    
+    def test_snapshot_hash_mismatch_drops_permissions(self):
+        store = self.store()
+        store.save(dict(TOKENS, **SNAPSHOT))
+        # A snapshot left behind by another session
+        store._write(store.snapshot_path, dict(SNAPSHOT, permissions_hash='hash-v2'))
+        
+        token_data = self.store().load()
+        self.assertEqual(token_data, TOKENS)
+        for key in ('permissions', 'permissions_etag'):
+            self.assertNotIn(key, token_data)
+    
+    def test_snapshot_written_only_when_hash_changes(self):
+        store = self.store()
+        store.save(dict(TOKENS, **SNAPSHOT))
+        written = store._stat_snapshot()
+        
+        store.save(dict(TOKENS, access_token='refreshed', **SNAPSHOT))
+        self.assertEqual(store._stat_snapshot(), written)
+        self.assertEqual(self.store().load()['access_token'], 'refreshed')
+        
+        store.save(dict(TOKENS, **dict(SNAPSHOT, permissions_hash='hash-v2')))
+        self.assertNotEqual(store._stat_snapshot(), written)
+    
+    def test_snapshot_replaced_by_another_instance_is_rewritten(self):
+        first, second = self.store(), self.store()
+        first.save(dict(TOKENS, **SNAPSHOT))
+        other = dict(SNAPSHOT, permissions={'Laporan': {'can_view': True}}, permissions_hash='hash-v2')
+        second.save(dict(TOKENS, **other))
+        # The first instance refreshes its token, still on its own snapshot
+        first.save(dict(TOKENS, access_token='refreshed', **SNAPSHOT))
+        
+        self.assertEqual(self.store().load(), dict(TOKENS, access_token='refreshed', **SNAPSHOT))
+    
+    def test_loads_single_file_layout(self):
+        FileTokenStore(self.path, self.key_file).save(dict(TOKENS, **SNAPSHOT))
+        self.assertEqual(self.store().load(), dict(TOKENS, **SNAPSHOT))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
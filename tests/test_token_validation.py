@@ -0,0 +1,129 @@
+import base64
+import json
+import time
+import unittest
+
+from support import MENU_PERMISSIONS, logged_in_session
+
+from auth.login_manager import (TOKEN_EXPIRING, TOKEN_INVALID, TOKEN_REVALIDATE, TOKEN_VALID,
+                                LoginManager)
+from benchmarks.stub_transport import StubTransport
+
+USER = {'id': 2, 'username': 'test_admin', 'role': 'admin_desa',
+        'assigned_desa': ['BANDARA'], 'assigned_kelompok': ['PRIMA']}
+
+
+def encode(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+
+
+def make_token(ttl=1800, skew=0, private_key=None, **claims):
+    """JWT issued by a server whose clock is `skew` seconds ahead of ours"""
+    now = int(time.time() + skew)
+    claims.update({'userId': USER['id'], 'iat': now, 'exp': now + ttl})
+    signing_input = f"{encode({'alg': 'RS256', 'typ': 'JWT'})}.{encode(claims)}"
+    if private_key is None:
+        return f"{signing_input}.signature"
+    
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+    signature = private_key.sign(signing_input.encode(), padding.PKCS1v15(), hashes.SHA256())
+    return f"{signing_input}.{base64.urlsafe_b64encode(signature).rstrip(b'=').decode()}"
+
+
+class SkewedTransport(StubTransport):
+    """Issues tokens stamped with a server clock `skew` seconds off ours"""
+    
+    def __init__(self, skew, private_key=None):
+        super().__init__(USER, MENU_PERMISSIONS, {'desa': ['BANDARA'], 'kelompok': ['PRIMA']})
+        self.skew = skew
+        self.private_key = private_key
+    
+    def request(self, method, endpoint, **kwargs):
+        response = super().request(method, endpoint, **kwargs)
+        if endpoint in ('login', 'refresh'):
+            response.json()['data']['access_token'] = make_token(self.ttl, self.skew, self.private_key)
+        return response
+
+
+def logged_in(skew=0, private_key=None, **options):
+    transport = SkewedTransport(skew, private_key)
+    login_manager = LoginManager(transport=transport, token_file=None,
+                                 revalidate_permissions_on_start=False, **options)
+    login_manager.login(USER['username'], 'password')
+    transport.reset_calls()
+    return login_manager, transport
+
+
+class LocalClassificationTest(unittest.TestCase):
+    def setUp(self):
+        self.login_manager, _, self.transport = logged_in_session()
+    
+    def classify(self, token):
+        self.login_manager.access_token = token
+        return self.login_manager._check_token_locally()
+    
+    def test_fresh_token_is_valid_without_requests(self):
+        self.assertEqual(self.login_manager._check_token_locally(), TOKEN_VALID)
+        self.assertTrue(self.login_manager.is_logged_in())
+        self.assertEqual(self.transport.call_count, 0)
+    
+    def test_token_near_expiry_is_expiring(self):
+        self.assertEqual(self.classify(make_token(ttl=30)), TOKEN_EXPIRING)
+        self.assertEqual(self.classify(make_token(ttl=-30)), TOKEN_EXPIRING)
+    
+    def test_undecodable_token_is_revalidated(self):
+        self.assertEqual(self.classify('not-a-jwt'), TOKEN_REVALIDATE)
+    
+    def test_revalidated_after_the_interval(self):
+        self.login_manager._last_verified_at = time.monotonic() - self.login_manager.revalidate_interval
+        self.assertEqual(self.login_manager._check_token_locally(), TOKEN_REVALIDATE)
+
+
+class SignatureTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        
+        cls.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        cls.public_pem = cls.private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    
+    def test_only_a_bad_signature_is_invalid(self):
+        login_manager, _ = logged_in(private_key=self.private_key, token_verify_key=self.public_pem)
+        self.assertEqual(login_manager._check_token_locally(), TOKEN_VALID)
+        
+        header, _, signature = login_manager.access_token.split('.')
+        forged = encode({'userId': USER['id'], 'role': 'super_admin',
+                         'iat': int(time.time()), 'exp': int(time.time()) + 1800})
+        login_manager.access_token = f"{header}.{forged}.{signature}"
+        self.assertEqual(login_manager._check_token_locally(), TOKEN_INVALID)
+
+
+class ClockSkewTest(unittest.TestCase):
+    def test_skewed_client_clock_keeps_tokens_valid(self):
+        # A client clock an hour behind sees tokens issued in the future, one
+        # an hour ahead sees them expired (ttl is 30 minutes)
+        for skew in (3600, -3600):
+            with self.subTest(skew=skew):
+                login_manager, transport = logged_in(skew)
+                self.assertAlmostEqual(login_manager.clock_offset, skew, delta=2)
+                for _ in range(5):
+                    self.assertTrue(login_manager.is_logged_in())
+                self.assertEqual(transport.call_count, 0)
+                self.assertGreater(login_manager.token_seconds_remaining(), 1700)
+    
+    def test_future_iat_before_the_offset_is_known(self):
+        login_manager, transport = logged_in(3600)
+        # e.g. a token saved by an older version without clock_offset
+        login_manager.clock_offset = 0.0
+        login_manager._token_check_cache = None
+        
+        self.assertNotEqual(login_manager._check_token_locally(), TOKEN_INVALID)
+        self.assertAlmostEqual(login_manager.clock_offset, 3600, delta=2)
+        self.assertEqual(login_manager._check_token_locally(), TOKEN_VALID)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
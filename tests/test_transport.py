@@ -0,0 +1,76 @@
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from support import ROOT  # noqa: F401
+
+from auth.transport import AuthTransport, budget_timeout
+
+
+class UnavailableHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.hits += 1
+        self.send_response(503)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def log_message(self, *args):
+        pass
+
+
+class BudgetTimeoutTest(unittest.TestCase):
+    def test_fits_connect_and_read_into_the_budget(self):
+        connect, read = budget_timeout((3, 5), 4)
+        self.assertAlmostEqual(connect + read, 4)
+        self.assertLessEqual(connect, 3)
+        self.assertEqual(budget_timeout((3, 5), 60), (3, 5))
+        self.assertEqual(budget_timeout(10, 2), 2)
+
+
+class TransportBudgetTest(unittest.TestCase):
+    def serve(self, handler):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        server.hits = 0
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+    
+    def transport(self, url):
+        transport = AuthTransport(url, backoff_factor=0.01)
+        self.addCleanup(transport.close)
+        return transport
+    
+    def test_gateway_errors_are_retried_without_a_budget(self):
+        server, url = self.serve(UnavailableHandler)
+        self.assertEqual(self.transport(url).get('verify').status_code, 503)
+        self.assertEqual(server.hits, 3)
+    
+    def test_budgeted_request_is_sent_once(self):
+        server, url = self.serve(UnavailableHandler)
+        transport = self.transport(url)
+        self.assertEqual(transport.get('verify', max_time=5).status_code, 503)
+        self.assertEqual(server.hits, 1)
+        # Requests without a budget on the same session still retry
+        transport.get('verify')
+        self.assertEqual(server.hits, 4)
+    
+    def test_silent_server_is_bounded_by_the_budget(self):
+        # Accepts connections but never answers
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(8)
+        self.addCleanup(listener.close)
+        transport = self.transport(f"http://127.0.0.1:{listener.getsockname()[1]}")
+        
+        import requests
+        started = time.monotonic()
+        with self.assertRaises(requests.exceptions.Timeout):
+            transport.get('verify', max_time=0.5)
+        self.assertLess(time.monotonic() - started, 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""Check the import-time budget of the auth package.
+
+Runs `python -X importtime` in a fresh interpreter, sums the cumulative
+import time of the auth modules and fails when it exceeds the budget or
+when a heavy dependency is imported eagerly.
+
+Usage: python tools/check_import_time.py [--budget-ms 50] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ['auth.login_manager', 'auth.permission_manager']
+
+# Heavy dependencies that may only be imported on first use
+DEFERRED_MODULES = ('requests', 'urllib3', 'cryptography', 'PIL', 'numpy', 'pandas')
+
+DEFAULT_BUDGET_MS = 50
+
+
+def measure(modules=MODULES):
+    """Return (total auth import time in ms, names of all imported modules)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + ', '.join(modules)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    
+    total_us = 0
+    imported = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported.append(name.strip())
+        # Top-level entries already include everything they imported
+        if not name[1:].startswith(' ') and name.strip().split('.')[0] == 'auth':
+            total_us += int(cumulative)
+    
+    return total_us / 1000, imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+    
+    timings = []
+    imported = []
+    for _ in range(args.runs):
+        elapsed_ms, imported = measure()
+        timings.append(elapsed_ms)
+    
+    median_ms = statistics.median(timings)
+    eager = sorted({name.split('.')[0] for name in imported} & set(DEFERRED_MODULES))
+    
+    print(f"auth import time: {median_ms:.1f} ms (median of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager)}")
+    if median_ms > args.budget_ms:
+        print("FAIL: import time budget exceeded")
+    
+    return 1 if eager or median_ms > args.budget_ms else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""Compile the role permission defaults of database/schema.sql.
+
+Writes auth/role_defaults.py: per-role permission bitmasks from the
+role_permissions seed rows, and the area catalog (every desa and kelompok,
+plus desa -> kelompok membership) from the desa/kelompok and users seed
+rows. LoginManager serves the permissions before the server's payload
+arrives and while offline without one; auth.area_index uses the catalog.
+Run again after changing the seeds; --check fails when the module is out
+of date.
+
+Usage: python tools/compile_role_defaults.py [--check]
+"""
+import argparse
+import hashlib
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import schema_seed  # noqa: E402
+from auth.permission_matrix import mask_from_flags  # noqa: E402
+
+OUTPUT_PATH = os.path.join(ROOT, 'auth', 'role_defaults.py')
+
+HEADER = '''"""Role permission defaults compiled from database/schema.sql.
+
+Generated by tools/compile_role_defaults.py; do not edit by hand.
+"""
+
+# sha256 of the schema file the tables were compiled from
+SCHEMA_SHA256 = {schema_hash!r}
+
+# role -> ((menu_name, mask), ...); VIEW=1, CREATE=2, EDIT=4, DELETE=8
+ROLE_NAME_MASKS = {{
+'''
+
+
+def _tuple(values):
+    return '(' + ', '.join(repr(value) for value in values) + (',)' if len(values) == 1 else ')')
+
+
+def _wrapped(values, width=88):
+    """A tuple literal with its items wrapped over indented lines"""
+    lines = []
+    line = '   '
+    for value in values:
+        item = f" {value!r},"
+        if len(line) + len(item) > width and line.strip():
+            lines.append(line)
+            line = '   '
+        line += item
+    if line.strip():
+        lines.append(line)
+    return "(\n" + "\n".join(lines) + "\n)"
+
+
+def render(schema_path=schema_seed.SCHEMA_PATH):
+    with open(schema_path, 'rb') as f:
+        schema_hash = hashlib.sha256(f.read()).hexdigest()
+    
+    tables = schema_seed.load_seed(schema_path)
+    roles = schema_seed.role_permissions(tables)
+    
+    all_desa, all_kelompok = schema_seed.areas(tables)
+    
+    hierarchy = {}
+    for kelompok, desa in all_kelompok:
+        if desa:
+            hierarchy.setdefault(desa, []).append(kelompok)
+    for user in schema_seed.users(tables):
+        if len(user['assigned_desa']) == 1:
+            members = hierarchy.setdefault(user['assigned_desa'][0], [])
+            members.extend(name for name in user['assigned_kelompok'] if name not in members)
+    
+    lines = [HEADER.format(schema_hash=schema_hash)]
+    for role in sorted(roles):
+        lines.append(f"    {role!r}: (\n")
+        for menu_name, flags in roles[role].items():
+            lines.append(f"        ({menu_name!r}, {mask_from_flags(flags)}),\n")
+        lines.append("    ),\n")
+    lines.append("}\n\n")
+    
+    lines.append("# Complete area catalog, used for super_admin accounts\n")
+    lines.append(f"ALL_DESA = {_wrapped(all_desa)}\n\n")
+    lines.append(f"ALL_KELOMPOK = {_wrapped([name for name, desa in all_kelompok])}\n\n")
+    
+    lines.append("# desa -> kelompok known from the seed rows\n")
+    lines.append("DESA_KELOMPOK = {\n")
+    for desa in sorted(hierarchy):
+        lines.append(f"    {desa!r}: {_tuple(hierarchy[desa])},\n")
+    lines.append("}\n")
+    return ''.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--check', action='store_true', help='fail if auth/role_defaults.py is out of date')
+    parser.add_argument('--schema', default=schema_seed.SCHEMA_PATH)
+    parser.add_argument('--output', default=OUTPUT_PATH)
+    args = parser.parse_args(argv)
+    
+    source = render(args.schema)
+    
+    if args.check:
+        current = None
+        if os.path.exists(args.output):
+            with open(args.output, encoding='utf-8') as f:
+                current = f.read()
+        if current != source:
+            print(f"FAIL: {args.output} is out of date, run tools/compile_role_defaults.py")
+            return 1
+        print(f"{args.output} is up to date")
+        return 0
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(source)
+    print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""Run many concurrent LoginManager sessions against the auth API.
+
+By default an in-process mock server (tools/mock_api_server.py) is
+started; pass --url to target another deployment. Each session logs in
+as one of the seeded users and then loops over is_logged_in and
+permission checks until --duration elapses. Request latency, outcomes
+and refresh counts are reported from the shared AuthMetrics.
+
+Usage: python tools/load_test.py [--sessions 50] [--duration 10]
+           [--access-ttl 30] [--latency 0.05] [--error-rate 0.01]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import mock_api_server  # noqa: E402
+from auth.login_manager import LoginManager  # noqa: E402
+from auth.metrics import AuthMetrics  # noqa: E402
+from auth.permission_manager import PermissionManager  # noqa: E402
+from auth.refresh_scheduler import RefreshScheduler  # noqa: E402
+from auth.transport import AuthTransport  # noqa: E402
+
+MENUS = ('dashboard', 'input_data', 'manajemen_kegiatan', 'scan_qr', 'pencarian_data', 'laporan')
+
+
+def credentials(api):
+    """(username, password) pairs accepted by login.js for the seed users"""
+    return [
+        (name, mock_api_server.SUPERADMIN_PASSWORD if name == 'superadmin' else user['password_hash'])
+        for name, user in api.users.items()
+    ]
+
+
+def percentile(histogram, fraction):
+    """Upper bucket bound below which `fraction` of the observations fall"""
+    target = histogram['count'] * fraction
+    for bound, cumulative in histogram['buckets'].items():
+        if cumulative >= target:
+            return bound
+    return '+Inf'
+
+
+def run_session(index, url, user, args, metrics, scheduler, workdir, deadline, results):
+    session_dir = os.path.join(workdir, f"session_{index}")
+    os.makedirs(session_dir)
+    login_manager = LoginManager(
+        api_base_url=url,
+        transport=AuthTransport(url, metrics=metrics),
+        revalidate_interval=args.revalidate_interval,
+        token_file=os.path.join(session_dir, 'auth_tokens.dat'),
+        key_file=os.path.join(session_dir, 'auth.key')
+    )
+    permission_manager = PermissionManager(login_manager)
+    
+    started = time.perf_counter()
+    success, message = login_manager.login(*user)
+    login_time = time.perf_counter() - started
+    if not success:
+        results.append({'login': False, 'error': message, 'ops': 0, 'logged_out': 0})
+        return
+    
+    if scheduler:
+        login_manager.start_auto_refresh(scheduler=scheduler)
+    
+    ops = 0
+    logged_out = 0
+    while time.monotonic() < deadline:
+        if not login_manager.is_logged_in():
+            logged_out += 1
+        permission_manager.can_access_menu(MENUS[ops % len(MENUS)])
+        login_manager.has_permission('Dashboard')
+        ops += 1
+        if args.think_time:
+            time.sleep(args.think_time)
+    
+    login_manager.stop_auto_refresh()
+    login_manager.transport.close()
+    results.append({'login': True, 'login_time': login_time, 'ops': ops, 'logged_out': logged_out})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='API base URL; starts a local mock server when omitted')
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of checks per session')
+    parser.add_argument('--think-time', type=float, default=0.01, help='pause between checks')
+    parser.add_argument('--revalidate-interval', type=float, default=300)
+    parser.add_argument('--auto-refresh', action='store_true', help='refresh tokens with a shared RefreshScheduler')
+    mock_api_server.add_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    server = None
+    api = mock_api_server.api_from_args(args)
+    url = args.url
+    if not url:
+        server, url = mock_api_server.serve(api)
+    
+    scheduler = None
+    if args.auto_refresh:
+        scheduler = RefreshScheduler(lead_time=min(120, args.access_ttl / 3), jitter=min(60, args.access_ttl / 6))
+    
+    users = credentials(api)
+    metrics = AuthMetrics()
+    results = []
+    workdir = tempfile.mkdtemp(prefix='auth-load-')
+    
+    print(f"{args.sessions} sessions for {args.duration:.0f}s against {url}")
+    started = time.monotonic()
+    deadline = started + args.duration
+    try:
+        with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+            futures = [
+                executor.submit(run_session, index, url, users[index % len(users)], args,
+                                metrics, scheduler, workdir, deadline, results)
+                for index in range(args.sessions)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        if scheduler:
+            scheduler.stop()
+        if server:
+            server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    elapsed = time.monotonic() - started
+    logged_in = [result for result in results if result['login']]
+    total_ops = sum(result['ops'] for result in results)
+    snapshot = metrics.snapshot()
+    
+    print(f"\nLogins: {len(logged_in)}/{len(results)} succeeded")
+    if logged_in:
+        login_times = sorted(result['login_time'] for result in logged_in)
+        print(f"Login time: median {login_times[len(login_times) // 2] * 1000:.0f} ms, "
+              f"max {login_times[-1] * 1000:.0f} ms")
+    print(f"Checks: {total_ops} in {elapsed:.1f}s ({total_ops / elapsed:.0f}/s), "
+          f"{sum(result['logged_out'] for result in results)} reported logged out")
+    
+    print("\nEndpoint        requests  p50 <=   p95 <=   outcomes")
+    for endpoint, data in sorted(snapshot['requests'].items()):
+        latency = data['latency']
+        outcomes = ', '.join(f"{name}={count}" for name, count in sorted(data['outcomes'].items()))
+        print(f"{endpoint:<15} {latency['count']:>8}  {percentile(latency, 0.5):>7}  "
+              f"{percentile(latency, 0.95):>7}  {outcomes}")
+    
+    print(f"\nCounters: {snapshot['counters']}")
+    print(f"Derived: {snapshot['derived']}")
+    if server:
+        print(f"Server requests: {api.request_counts}")
+    
+    return 0 if len(logged_in) == len(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
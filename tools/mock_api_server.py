@@ -0,0 +1,473 @@
+"""Local stand-in for the auth API.
+
+Implements the request and response contracts of api/auth/login.js,
+verify.js, refresh.js and the api/user/ endpoints with the roles and
+users seeded in database/schema.sql held in memory. Latency, error rate
+and token lifetimes are configurable, so the desktop client can be
+exercised without network access.
+
+Usage: python tools/mock_api_server.py [--port 8787] [--latency 0.05]
+           [--error-rate 0.01] [--access-ttl 1800]
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import schema_seed  # noqa: E402
+from auth import jwt_utils  # noqa: E402
+
+# login.js accepts this password for the seeded super admin
+SUPERADMIN_PASSWORD = 'admin123'
+
+# Limits of list.js and create.js
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+MAX_BULK_USERS = 100
+
+UPDATE_USER_PREFIX = '/api/user/update/'
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def sign_token(claims, secret):
+    """Create an HS256 JWT like jsonwebtoken's jwt.sign()"""
+    header = _b64url(json.dumps({'alg': 'HS256', 'typ': 'JWT'}, separators=(',', ':')).encode())
+    payload = _b64url(json.dumps(claims, separators=(',', ':')).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+
+class MockAuthAPI:
+    """In-memory implementation of the auth endpoints"""
+    
+    def __init__(self, seed=None, jwt_secret='local-jwt-secret', refresh_secret='local-refresh-secret',
+                 access_ttl=1800, refresh_ttl=7 * 24 * 3600, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, random_seed=None):
+        seed = seed or schema_seed.load_seed()
+        self.users = {user['username']: user for user in schema_seed.users(seed)}
+        self.role_permissions = schema_seed.role_permissions(seed)
+        
+        self.jwt_secret = jwt_secret
+        self.refresh_secret = refresh_secret
+        self.access_ttl = access_ttl
+        self.refresh_ttl = refresh_ttl
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        
+        self.sessions = {}
+        self.request_counts = {}
+        self._random = random.Random(random_seed)
+        self._lock = threading.Lock()
+        
+        self.routes = {
+            ('POST', '/api/auth/login'): self.login,
+            ('POST', '/api/auth/refresh'): self.refresh,
+            ('GET', '/api/auth/verify'): self.verify,
+            ('GET', '/api/user/permissions'): self.permissions,
+            ('GET', '/api/user/list'): self.list_users,
+            ('POST', '/api/user/create'): self.create_user
+        }
+    
+    def handle(self, method, path, headers, body):
+        """Return (status, extra headers, JSON payload or None)"""
+        url = urlsplit(path)
+        path = url.path
+        params = dict(parse_qsl(url.query))
+        with self._lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            fail = self.error_rate and self._random.random() < self.error_rate
+        
+        if delay:
+            time.sleep(delay)
+        
+        if method == 'OPTIONS':
+            return 200, {}, None
+        
+        handler = self.routes.get((method, path))
+        if path.startswith(UPDATE_USER_PREFIX):
+            params['id'] = path[len(UPDATE_USER_PREFIX):]
+            handler = self.update_user if method == 'PUT' else None
+            path = UPDATE_USER_PREFIX
+        
+        if handler is None:
+            known = path == UPDATE_USER_PREFIX or any(route_path == path for _, route_path in self.routes)
+            return (405, {}, {'error': 'Method not allowed'}) if known else (404, {}, {'error': 'Not found'})
+        
+        if fail:
+            return self.error_status, {}, {'error': 'Injected failure'}
+        
+        return handler(headers, body, params)
+    
+    def _access_token(self, user):
+        now = int(time.time())
+        return sign_token({
+            'userId': user['id'],
+            'username': user['username'],
+            'role': user['role'],
+            'assigned_desa': user['assigned_desa'],
+            'assigned_kelompok': user['assigned_kelompok'],
+            'iat': now,
+            'exp': now + self.access_ttl
+        }, self.jwt_secret)
+    
+    def _decode(self, token, secret):
+        if not token or not jwt_utils.verify_signature(token, secret):
+            return None
+        
+        claims = jwt_utils.decode_claims(token)
+        remaining = jwt_utils.seconds_until_expiry(claims)
+        if remaining is not None and remaining <= 0:
+            return None
+        return claims
+    
+    def _bearer_claims(self, headers):
+        auth_header = headers.get('Authorization') or ''
+        if not auth_header.startswith('Bearer '):
+            return None, (401, {}, {'error': 'Token tidak ditemukan'})
+        return self._decode(auth_header[7:], self.jwt_secret), None
+    
+    @staticmethod
+    def _public_user(user):
+        return {
+            'id': user['id'],
+            'username': user['username'],
+            'email': user.get('email'),
+            'role': user['role'],
+            'assigned_desa': user['assigned_desa'],
+            'assigned_kelompok': user['assigned_kelompok']
+        }
+    
+    def login(self, headers, body, params):
+        username = body.get('username')
+        password = body.get('password')
+        if not username or not password:
+            return 400, {}, {'error': 'Username dan password harus diisi'}
+        
+        user = self.users.get(username)
+        if not user or user.get('status') != 'active':
+            return 401, {}, {'error': 'Username atau password salah'}
+        
+        if password != user['password_hash'] and not (
+            password == SUPERADMIN_PASSWORD and username == 'superadmin'
+        ):
+            return 401, {}, {'error': 'Username atau password salah'}
+        
+        now = int(time.time())
+        refresh_token = sign_token({
+            'userId': user['id'], 'username': user['username'], 'iat': now, 'exp': now + self.refresh_ttl
+        }, self.refresh_secret)
+        
+        session_id = f"session_{user['id']}_{int(time.time() * 1000)}"
+        with self._lock:
+            self.sessions[session_id] = {
+                'user_id': user['id'],
+                'device_type': body.get('device_type', 'desktop'),
+                'device_info': body.get('device_info', 'Python App'),
+                'login_time': now,
+                'last_activity': now
+            }
+        
+        return 200, {}, {
+            'success': True,
+            'message': 'Login berhasil',
+            'data': {
+                'access_token': self._access_token(user),
+                'refresh_token': refresh_token,
+                'session_id': session_id,
+                'user': self._public_user(user)
+            }
+        }
+    
+    def refresh(self, headers, body, params):
+        refresh_token = body.get('refresh_token')
+        if not refresh_token:
+            return 400, {}, {'error': 'Refresh token harus disediakan'}
+        
+        claims = self._decode(refresh_token, self.refresh_secret)
+        if claims is None:
+            return 401, {}, {'error': 'Refresh token tidak valid atau expired'}
+        
+        user = next((user for user in self.users.values() if user['id'] == claims.get('userId')), None)
+        if not user or user.get('status') != 'active':
+            return 401, {}, {'error': 'User tidak ditemukan atau tidak aktif'}
+        
+        user_data = self._public_user(user)
+        user_data.pop('email')
+        return 200, {}, {
+            'success': True,
+            'message': 'Token berhasil diperbarui',
+            'data': {'access_token': self._access_token(user), 'user': user_data}
+        }
+    
+    def verify(self, headers, body, params):
+        claims, error = self._bearer_claims(headers)
+        if error:
+            return error
+        if claims is None:
+            return 401, {}, {'success': False, 'valid': False, 'error': 'Token tidak valid atau expired'}
+        
+        return 200, {}, {
+            'success': True,
+            'valid': True,
+            'user': {
+                'id': claims.get('userId'),
+                'username': claims.get('username'),
+                'role': claims.get('role'),
+                'assigned_desa': claims.get('assigned_desa'),
+                'assigned_kelompok': claims.get('assigned_kelompok')
+            }
+        }
+    
+    def permissions(self, headers, body, params):
+        claims, error = self._bearer_claims(headers)
+        if error:
+            return error
+        if claims is None:
+            return 401, {}, {'error': 'Token tidak valid atau expired'}
+        
+        menus = self.role_permissions.get(claims.get('role'), {})
+        data = {
+            'user': {
+                'id': claims.get('userId'),
+                'username': claims.get('username'),
+                'role': claims.get('role'),
+                'assigned_desa': claims.get('assigned_desa'),
+                'assigned_kelompok': claims.get('assigned_kelompok')
+            },
+            'permissions': {name: dict(menus[name]) for name in sorted(menus)},
+            'accessible_areas': {
+                'desa': claims.get('assigned_desa') or [],
+                'kelompok': claims.get('assigned_kelompok') or []
+            }
+        }
+        
+        payload = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+        etag = '"' + hashlib.sha256(payload.encode()).hexdigest() + '"'
+        cache_headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if headers.get('If-None-Match') == etag:
+            return 304, cache_headers, None
+        
+        return 200, cache_headers, {'success': True, 'data': data}
+    
+    
+    def _admin_claims(self, headers, denied):
+        claims, error = self._bearer_claims(headers)
+        if error or claims is None:
+            return None, (401, {}, {'error': 'Token tidak valid'})
+        if claims.get('role') != 'super_admin':
+            return None, (403, {}, {'error': denied})
+        return claims, None
+    
+    @staticmethod
+    def _listed_user(user):
+        return {key: user.get(key) for key in (
+            'id', 'username', 'email', 'role', 'assigned_desa', 'assigned_kelompok', 'status', 'created_at'
+        )}
+    
+    def list_users(self, headers, body, params):
+        _, error = self._admin_claims(headers, 'Akses ditolak. Hanya super admin yang bisa melihat daftar user.')
+        if error:
+            return error
+        
+        with self._lock:
+            users = sorted(self.users.values(), key=lambda user: user['id'])
+        
+        if 'limit' not in params:
+            users = sorted(users, key=lambda user: user.get('created_at') or 0, reverse=True)
+            return 200, {}, {'success': True, 'data': [self._listed_user(user) for user in users]}
+        
+        try:
+            page_size = int(params['limit'])
+        except ValueError:
+            page_size = DEFAULT_PAGE_SIZE
+        page_size = min(max(page_size or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+        
+        if params.get('cursor'):
+            users = [user for user in users if user['id'] > int(params['cursor'])]
+        page = users[:page_size]
+        has_more = len(users) > page_size
+        return 200, {}, {
+            'success': True,
+            'data': [self._listed_user(user) for user in page],
+            'next_cursor': str(page[-1]['id']) if has_more else None
+        }
+    
+    def _insert_user(self, user, created_by):
+        # Called with the lock held
+        new_user = {
+            'id': max((existing['id'] for existing in self.users.values()), default=0) + 1,
+            'username': user['username'],
+            'email': user.get('email'),
+            'password_hash': user['password'],
+            'role': user['role'],
+            'assigned_desa': user.get('assigned_desa') or [],
+            'assigned_kelompok': user.get('assigned_kelompok') or [],
+            'status': 'active',
+            'created_by': created_by,
+            'created_at': time.time()
+        }
+        self.users[new_user['username']] = new_user
+        return {key: new_user[key] for key in (
+            'id', 'username', 'email', 'role', 'assigned_desa', 'assigned_kelompok'
+        )}
+    
+    def create_user(self, headers, body, params):
+        claims, error = self._admin_claims(headers, 'Akses ditolak. Hanya super admin yang bisa membuat user.')
+        if error:
+            return error
+        
+        if isinstance(body.get('users'), list):
+            return self._create_users(body['users'], claims)
+        
+        if not body.get('username') or not body.get('password') or not body.get('role'):
+            return 400, {}, {'error': 'Username, password, dan role harus diisi'}
+        
+        with self._lock:
+            if body['username'] in self.users:
+                return 400, {}, {'error': 'Username sudah digunakan'}
+            data = self._insert_user(body, claims.get('userId'))
+        
+        return 201, {}, {'success': True, 'message': 'User berhasil dibuat', 'data': data}
+    
+    def _create_users(self, users, claims):
+        if not users or len(users) > MAX_BULK_USERS:
+            return 400, {}, {'error': f"Jumlah user harus antara 1 dan {MAX_BULK_USERS}"}
+        
+        results = []
+        with self._lock:
+            for index, user in enumerate(users):
+                user = user if isinstance(user, dict) else {}
+                result = {'index': index, 'username': user.get('username'), 'success': False}
+                if not user.get('username') or not user.get('password') or not user.get('role'):
+                    result['error'] = 'Username, password, dan role harus diisi'
+                elif user['username'] in self.users:
+                    result['error'] = 'Username sudah digunakan'
+                else:
+                    result['success'] = True
+                    result['data'] = self._insert_user(user, claims.get('userId'))
+                results.append(result)
+        
+        created = sum(1 for result in results if result['success'])
+        return 201 if created else 400, {}, {
+            'success': created > 0,
+            'message': f"{created} dari {len(users)} user berhasil dibuat",
+            'created': created,
+            'results': results
+        }
+    
+    def update_user(self, headers, body, params):
+        _, error = self._admin_claims(headers, 'Akses ditolak')
+        if error:
+            return error
+        
+        with self._lock:
+            user = next((user for user in self.users.values() if str(user['id']) == params['id']), None)
+            if user is None:
+                return 500, {}, {'error': 'Gagal mengupdate user'}
+            
+            for field in ('username', 'email', 'role', 'status', 'assigned_desa', 'assigned_kelompok'):
+                if field in body:
+                    user[field] = body[field]
+            if body.get('password'):
+                user['password_hash'] = body['password']
+            
+            # Keep the username index in sync
+            self.users = {existing['username']: existing for existing in self.users.values()}
+            data = {key: value for key, value in user.items() if key != 'password_hash'}
+        
+        return 200, {}, {'success': True, 'message': 'User berhasil diupdate', 'data': data}
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    api = None
+    
+    def _dispatch(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+        
+        status, headers, payload = self.api.handle(self.command, self.path, self.headers, body)
+        data = json.dumps(payload).encode() if payload is not None else b''
+        
+        self.send_response(status)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if payload is not None:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    do_GET = do_POST = do_PUT = do_OPTIONS = _dispatch
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(api=None, host='127.0.0.1', port=0):
+    """Start the server on a daemon thread; returns (server, base URL)"""
+    handler = type('RequestHandler', (_RequestHandler,), {'api': api or MockAuthAPI()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='mock-api', daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def add_arguments(parser):
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random latency, up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with --error-status')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--access-ttl', type=int, default=1800, help='access token lifetime in seconds')
+    parser.add_argument('--refresh-ttl', type=int, default=7 * 24 * 3600)
+    parser.add_argument('--seed', type=int, default=None, help='random seed for latency and errors')
+
+
+def api_from_args(args):
+    return MockAuthAPI(access_ttl=args.access_ttl, refresh_ttl=args.refresh_ttl,
+                       latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                       error_status=args.error_status, random_seed=args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    api = api_from_args(args)
+    server, url = serve(api, args.host, args.port)
+    print(f"Mock auth API on {url} (users: {', '.join(api.users)})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""Read the seed rows of database/schema.sql.
+
+Only the INSERT statements are parsed; they are returned as a list of
+column -> value dicts per table. Values become str, int, bool, None or,
+for PostgreSQL array literals such as '{"A", "B"}', a list of str.
+"""
+import os
+import re
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(ROOT, 'database', 'schema.sql')
+
+INSERT_RE = re.compile(r"INSERT\s+INTO\s+(\w+)\s*\(([^)]*)\)\s*VALUES", re.IGNORECASE)
+
+
+def _strip_comments(sql):
+    lines = []
+    for line in sql.splitlines():
+        in_string = False
+        for i, char in enumerate(line):
+            if char == "'":
+                in_string = not in_string
+            elif char == '-' and not in_string and line[i:i + 2] == '--':
+                line = line[:i]
+                break
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _parse_array(literal):
+    inner = literal.strip()[1:-1].strip()
+    if not inner:
+        return []
+    return [item.strip().strip('"') for item in re.findall(r'"[^"]*"|[^,]+', inner)]
+
+
+def _parse_value(token):
+    token = token.strip()
+    if token.startswith("'"):
+        text = token[1:-1].replace("''", "'")
+        if text.startswith('{') and text.endswith('}'):
+            return _parse_array(text)
+        return text
+    
+    upper = token.upper()
+    if upper == 'TRUE':
+        return True
+    if upper == 'FALSE':
+        return False
+    if upper == 'NULL':
+        return None
+    try:
+        return int(token)
+    except ValueError:
+        return token
+
+
+def _parse_rows(values_sql):
+    """Split `(a, 'b'), (c, 'd');` into lists of raw value tokens"""
+    rows = []
+    row = None
+    token = ''
+    in_string = False
+    i = 0
+    while i < len(values_sql):
+        char = values_sql[i]
+        if in_string:
+            token += char
+            if char == "'":
+                if values_sql[i + 1:i + 2] == "'":
+                    token += "'"
+                    i += 1
+                else:
+                    in_string = False
+        elif char == "'":
+            in_string = True
+            token += char
+        elif char == '(' and row is None:
+            row = []
+            token = ''
+        elif char == ',' and row is not None:
+            row.append(token)
+            token = ''
+        elif char == ')' and row is not None:
+            row.append(token)
+            rows.append(row)
+            row = None
+            token = ''
+        elif char == ';' and row is None:
+            break
+        elif row is not None:
+            token += char
+        i += 1
+    return rows
+
+
+def load_seed(path=SCHEMA_PATH):
+    """Return {table: [row dict, ...]} for every INSERT in the schema file"""
+    with open(path, encoding='utf-8') as f:
+        sql = _strip_comments(f.read())
+    
+    tables = {}
+    for match in INSERT_RE.finditer(sql):
+        columns = [column.strip() for column in match.group(2).split(',')]
+        for raw in _parse_rows(sql[match.end():]):
+            tables.setdefault(match.group(1), []).append(
+                dict(zip(columns, (_parse_value(value) for value in raw)))
+            )
+    return tables
+
+
+def role_permissions(tables):
+    """Return {role: {menu_name: {'can_view': ..., ...}}} from the seed rows"""
+    roles = {}
+    for row in tables.get('role_permissions', []):
+        roles.setdefault(row['role'], {})[row['menu_name']] = {
+            'can_view': row.get('can_view', False),
+            'can_create': row.get('can_create', False),
+            'can_edit': row.get('can_edit', False),
+            'can_delete': row.get('can_delete', False)
+        }
+    return roles
+
+
+def users(tables):
+    """Return the seed users with the ids SERIAL would assign"""
+    result = []
+    for user_id, row in enumerate(tables.get('users', []), start=1):
+        user = dict(row)
+        user['id'] = user_id
+        user.setdefault('status', 'active')
+        user['assigned_desa'] = user.get('assigned_desa') or []
+        user['assigned_kelompok'] = user.get('assigned_kelompok') or []
+        result.append(user)
+    return result
+
+def areas(tables):
+    """Return (desa names, [(kelompok, desa or None), ...]) from the area catalog rows"""
+    desa = [row['name'] for row in tables.get('desa', [])]
+    kelompok = [(row['name'], row.get('desa')) for row in tables.get('kelompok', [])]
+    return desa, kelompok
\ No newline at end of file